@@ -0,0 +1,53 @@
+class AchievementIndex:
+    """
+    Achievements indexed by the stat they watch, sorted by threshold.
+
+    Each achievement type (None for bufos earned, "clicks", "time", ...)
+    watches one stat. The content loader sorts every type's achievements
+    by requirement once; the index keeps a cursor at the first one not yet
+    reached, so checking a stat after it changed is a single comparison
+    against the next threshold, however many achievements watch it.
+    rebuild() is only needed when achievements are un-earned wholesale
+    (reset).
+    """
+
+    def __init__(self, achievements, thresholds):
+        # Sorted (requirement, achievement index) pairs by type, as compiled by the content loader
+        self.compiled = thresholds
+        self.rebuild(achievements)
+
+    def rebuild(self, achievements):
+        """Point the index at achievements and rewind all cursors"""
+        self.thresholds = {achievement_type: [(requirement, achievements[i]) for requirement, i in pairs]
+                           for achievement_type, pairs in self.compiled.items()}
+
+        # Position of the next achievement to check for each type
+        self.cursors = dict.fromkeys(self.thresholds, 0)
+
+    def next_threshold(self, achievement_type):
+        """The lowest requirement of the type not reached yet, or None if all are"""
+        entries = self.thresholds.get(achievement_type)
+        if entries is None:
+            return None
+
+        i = self.cursors[achievement_type]
+        while i < len(entries) and entries[i][1]["earned"]:
+            i += 1
+        self.cursors[achievement_type] = i
+        return entries[i][0] if i < len(entries) else None
+
+    def check(self, achievement_type, value):
+        """Achievements of the type that value newly reaches, advancing past them"""
+        threshold = self.next_threshold(achievement_type)
+        if threshold is None or value < threshold:
+            return []
+
+        entries = self.thresholds[achievement_type]
+        i = self.cursors[achievement_type]
+        reached = []
+        while i < len(entries) and (entries[i][1]["earned"] or value >= entries[i][0]):
+            if not entries[i][1]["earned"]:
+                reached.append(entries[i][1])
+            i += 1
+        self.cursors[achievement_type] = i
+        return reached
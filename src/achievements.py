@@ -1,82 +0,0 @@
-# Define game achievements with their properties
-
-ACHIEVEMENTS = [
-    {
-        "name": "Bufo Beginner's Luck", 
-        "description": "Get your first bufo. Every journey begins with a single hop!", 
-        "earned": False, 
-        "requirement": 1
-    },
-    {
-        "name": "Bufoally Committed", 
-        "description": "Get 100 bufos. You're bufoally into this!", 
-        "earned": False, 
-        "requirement": 100
-    },
-    {
-        "name": "Bufo-al Dedication", 
-        "description": "Get 1,000 bufos. That's a lot of mouths to feed!", 
-        "earned": False, 
-        "requirement": 1000
-    },
-    {
-        "name": "Bufo-al Eclipse", 
-        "description": "Get 10,000 bufos. They're blocking out the sun!", 
-        "earned": False, 
-        "requirement": 10000
-    },
-    {
-        "name": "Bufo to Glory", 
-        "description": "Get 1,000,000 bufos. You're on the bufo to glory!", 
-        "earned": False, 
-        "requirement": 1000000
-    },
-    {
-        "name": "Hop, Click and Jump", 
-        "description": "Click 100 times. Your finger must be tired!", 
-        "earned": False, 
-        "requirement": 100, 
-        "type": "clicks"
-    },
-    {
-        "name": "Clickin' Ain't Easy", 
-        "description": "Click 1,000 times. Carpal tunnel syndrome incoming!", 
-        "earned": False, 
-        "requirement": 1000, 
-        "type": "clicks"
-    },
-    {
-        "name": "Bufo Sage", 
-        "description": "Own at least one of each building. Diversify your bufo portfolio!", 
-        "earned": False, 
-        "type": "buildings"
-    },
-    {
-        "name": "Bufo-ally Insane", 
-        "description": "Play for 1 hour straight. That's bufo-ally insane!", 
-        "earned": False, 
-        "requirement": 60, 
-        "type": "time"
-    },
-    {
-        "name": "Golden Touch", 
-        "description": "Catch your first golden bufo. Quick reflexes!", 
-        "earned": False, 
-        "requirement": 1, 
-        "type": "golden_bufos"
-    },
-    {
-        "name": "Golden Hunter", 
-        "description": "Catch 5 golden bufos. You've got skills!", 
-        "earned": False, 
-        "requirement": 5, 
-        "type": "golden_bufos"
-    },
-    {
-        "name": "Golden Master", 
-        "description": "Catch 25 golden bufos. Nothing escapes your watchful eye!", 
-        "earned": False, 
-        "requirement": 25, 
-        "type": "golden_bufos"
-    }
-]
\ No newline at end of file
@@ -0,0 +1,124 @@
+import json
+import os
+import time
+from collections import deque
+
+import pygame
+
+from src.atlas import load_atlas
+from src.image_cache import ImageCache
+
+# Seconds per frame spent streaming queued assets in (at least one asset is loaded per frame)
+ASSET_LOAD_BUDGET = 0.004
+
+class AssetManager:
+    """
+    Lazily loaded images and sounds.
+
+    Registering an asset only records how to load it. An asset is loaded
+    the first time it is used, or earlier if it was queued with preload():
+    update() works through the preload queue once per frame, stopping once
+    the frame's load budget is spent. Startup therefore only pays for what
+    the first frame actually draws, and the rest streams in afterwards.
+    """
+
+    def __init__(self, load_budget=ASSET_LOAD_BUDGET):
+        self.load_budget = load_budget
+
+        # Loaded images and their pre-scaled variants
+        self.images = ImageCache()
+
+        # Ways to load each image, tried in order until one succeeds
+        self.image_loaders = {}
+
+        # Sound paths and the sounds loaded so far (None for missing ones)
+        self.sound_paths = {}
+        self.sounds = {}
+
+        # Pending (function, args) preload jobs
+        self.queue = deque()
+
+    def add_atlas(self, manifest_path):
+        """Register every sprite of a texture atlas (only the small manifest is read now)"""
+        with open(manifest_path, "r") as f:
+            sprite_names = list(json.load(f)["sprites"])
+
+        load_sprites = lambda: self.load_atlas_sprites(manifest_path)
+        for name in sprite_names:
+            self.image_loaders.setdefault(name, []).insert(0, load_sprites)
+
+    def add_image(self, name, path, fallback):
+        """Register an image file, with a function creating a placeholder if it cannot be loaded"""
+        loaders = self.image_loaders.setdefault(name, [])
+        loaders.append(lambda: self.load_image_file(name, path))
+        loaders.append(lambda: self.images.add(name, fallback()))
+
+    def add_sound(self, name, path):
+        """Register a sound file"""
+        self.sound_paths[name] = path
+
+    def load_atlas_sprites(self, manifest_path):
+        for name, sprite in load_atlas(manifest_path).items():
+            if not self.images.has(name):
+                self.images.add(name, sprite)
+
+    def load_image_file(self, name, path):
+        print(f"Looking for image at: {path}")
+        print(f"File exists: {os.path.exists(path)}")
+        if os.path.exists(path):
+            self.images.load(name, path)
+        else:
+            print(f"Using fallback image for {name}")
+
+    def load_image(self, name):
+        """Load an image's original now, trying its loaders in order"""
+        for loader in self.image_loaders.pop(name, []):
+            try:
+                loader()
+            except Exception as e:
+                print(f"Error loading {name}: {e}")
+            if self.images.has(name):
+                return
+
+    def get_image(self, name, size=None):
+        """An image scaled to size in the display format, loading it on first use"""
+        if not self.images.has(name):
+            self.load_image(name)
+        return self.images.get(name, size)
+
+    def get_sound(self, name):
+        """A sound (or None if it is missing), loading it on first use"""
+        if name not in self.sounds:
+            path = self.sound_paths.get(name)
+            sound = None
+            if path and os.path.exists(path):
+                try:
+                    sound = pygame.mixer.Sound(path)
+                except Exception as e:
+                    print(f"Error loading sound {name}: {e}")
+            self.sounds[name] = sound
+        return self.sounds[name]
+
+    def preload(self, function, *args):
+        """Queue a load (e.g. self.get_image, name, size) to run on a later frame"""
+        self.queue.append((function, args))
+
+    def preload_image(self, name, size=None):
+        self.preload(self.get_image, name, size)
+
+    def preload_sound(self, name):
+        self.preload(self.get_sound, name)
+
+    def update(self):
+        """Run queued loads until this frame's budget is spent; returns how many ran"""
+        start = time.perf_counter()
+        loaded = 0
+
+        while self.queue:
+            function, args = self.queue.popleft()
+            function(*args)
+            loaded += 1
+            if time.perf_counter() - start >= self.load_budget:
+                break
+
+        return loaded
@@ -0,0 +1,111 @@
+"""
+Texture atlas packing and loading.
+
+At build time the sprite sources in assets_src (buildings, bufos) are
+packed into a single atlas image in the assets folder, with a JSON
+manifest of where each sprite lives:
+
+    python -m src.atlas [source_folder] [assets_folder]
+
+The sources are kept out of the shipped assets folder, so the game only
+ever bundles the atlas. If the atlas is missing, sprites fall back to
+generated placeholders.
+
+At runtime load_atlas() decodes the one atlas image and slices every
+sprite out of it as a subsurface, instead of opening and decoding a PNG
+per sprite. Full-screen backgrounds are left as separate files.
+"""
+
+import json
+import os
+import sys
+
+import pygame
+
+ATLAS_IMAGE = "atlas.png"
+ATLAS_SOURCES = "assets_src"
+ATLAS_MANIFEST = "atlas.json"
+ATLAS_VERSION = 1
+
+# Width of the packed atlas and the gap between sprites
+ATLAS_WIDTH = 512
+ATLAS_PADDING = 1
+
+# Images with a side larger than this (backgrounds) are not packed
+MAX_SPRITE_SIZE = 256
+
+def find_sprites(source_path):
+    """File names of the images in the source folder small enough to pack"""
+    sprites = {}
+    for file_name in sorted(os.listdir(source_path)):
+        if not file_name.endswith(".png") or file_name == ATLAS_IMAGE:
+            continue
+        image = pygame.image.load(os.path.join(source_path, file_name))
+        if image.get_width() <= MAX_SPRITE_SIZE and image.get_height() <= MAX_SPRITE_SIZE:
+            sprites[file_name] = image
+    return sprites
+
+def pack_rects(sizes, width=ATLAS_WIDTH, padding=ATLAS_PADDING):
+    """
+    Place rectangles on shelves, tallest first.
+
+    Takes {name: (width, height)} and returns ({name: (x, y, width, height)},
+    total height).
+    """
+    placements = {}
+    x = y = shelf_height = 0
+
+    for name, (w, h) in sorted(sizes.items(), key=lambda item: (-item[1][1], item[0])):
+        if w > width:
+            raise ValueError(f"Sprite {name} is wider than the atlas ({w} > {width})")
+
+        # Start a new shelf when this sprite does not fit on the current one
+        if x + w > width:
+            x = 0
+            y += shelf_height + padding
+            shelf_height = 0
+
+        placements[name] = (x, y, w, h)
+        x += w + padding
+        shelf_height = max(shelf_height, h)
+
+    return placements, y + shelf_height
+
+def build_atlas(source_path, assets_path):
+    """Pack the sprites of a source folder into atlas.png and atlas.json in the assets folder"""
+    sprites = find_sprites(source_path)
+    placements, height = pack_rects({name: image.get_size() for name, image in sprites.items()})
+
+    atlas = pygame.Surface((ATLAS_WIDTH, max(height, 1)), pygame.SRCALPHA)
+    atlas.fill((0, 0, 0, 0))
+    for name, (x, y, w, h) in placements.items():
+        atlas.blit(sprites[name], (x, y))
+
+    pygame.image.save(atlas, os.path.join(assets_path, ATLAS_IMAGE))
+
+    manifest = {
+        "version": ATLAS_VERSION,
+        "image": ATLAS_IMAGE,
+        "sprites": {name: list(rect) for name, rect in sorted(placements.items())}
+    }
+    with open(os.path.join(assets_path, ATLAS_MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest
+
+def load_atlas(manifest_path):
+    """Load an atlas from its manifest and return {file name: subsurface}"""
+    with open(manifest_path, "r") as f:
+        manifest = json.load(f)
+
+    if manifest.get("version") != ATLAS_VERSION:
+        raise ValueError(f"Unsupported atlas version {manifest.get('version')}")
+
+    atlas = pygame.image.load(os.path.join(os.path.dirname(manifest_path), manifest["image"]))
+    return {name: atlas.subsurface(pygame.Rect(rect)) for name, rect in manifest["sprites"].items()}
+
+if __name__ == "__main__":
+    source_path = sys.argv[1] if len(sys.argv) > 1 else ATLAS_SOURCES
+    assets_path = sys.argv[2] if len(sys.argv) > 2 else "assets"
+    manifest = build_atlas(source_path, assets_path)
+    print(f"Packed {len(manifest['sprites'])} sprites into {os.path.join(assets_path, ATLAS_IMAGE)}")
@@ -1,56 +1,42 @@
 import pygame
 import os
-from src.constants import SOUNDS_PATH, THEMES
+from src.constants import SOUNDS_PATH
 
 class AudioManager:
-    """Manages all game audio including sound effects and music"""
+    """
+    Manages all game audio including sound effects and music.
     
-    def __init__(self):
+    Sounds are registered with the asset manager and only decoded when first
+    played or when the asset manager gets to them in its preload queue.
+    """
+    
+    def __init__(self, assets, themes):
         pygame.mixer.init()
+        self.assets = assets
+        self.themes = themes
         
-        # Initialize sound dictionaries
-        self.click_sounds = {}
+        # Music track paths for each theme
         self.music_tracks = {}
         
-        # Load all audio assets
-        self.load_audio_assets()
+        # Register all audio assets
+        self.register_audio_assets()
     
-    def load_audio_assets(self):
-        """Load all sound effects and music tracks"""
-        try:
-            # Load click sounds for each theme
-            for theme in THEMES:
-                try:
-                    self.click_sounds[theme] = pygame.mixer.Sound(os.path.join(SOUNDS_PATH, THEMES[theme]["click_sound"]))
-                except:
-                    # Create a dummy sound if missing
-                    default_click_path = os.path.join(SOUNDS_PATH, "default_click.wav")
-                    if os.path.exists(default_click_path):
-                        self.click_sounds[theme] = pygame.mixer.Sound(default_click_path)
-                    else:
-                        # If even the default is missing, create a silent sound
-                        self.click_sounds[theme] = None
-                
-                # Store music track paths
-                self.music_tracks[theme] = os.path.join(SOUNDS_PATH, THEMES[theme]["music"])
-            
-            # Load other sound effects
-            achievement_path = os.path.join(SOUNDS_PATH, "achievement.wav")
-            upgrade_path = os.path.join(SOUNDS_PATH, "upgrade.wav")
-            boost_path = os.path.join(SOUNDS_PATH, "boost.wav")
-            
-            self.achievement_sound = pygame.mixer.Sound(achievement_path) if os.path.exists(achievement_path) else None
-            self.upgrade_sound = pygame.mixer.Sound(upgrade_path) if os.path.exists(upgrade_path) else None
-            self.boost_sound = pygame.mixer.Sound(boost_path) if os.path.exists(boost_path) else None
-            
-        except Exception as e:
-            print(f"Error loading audio assets: {e}")
-            # Set up fallbacks
-            self.click_sounds = {theme: None for theme in THEMES}
-            self.music_tracks = {theme: None for theme in THEMES}
-            self.achievement_sound = None
-            self.upgrade_sound = None
-            self.boost_sound = None
+    def register_audio_assets(self):
+        """Register all sound effects and music tracks without loading them"""
+        sound_names = [self.themes[theme]["click_sound"] for theme in self.themes]
+        sound_names += ["default_click.wav", "achievement.wav", "upgrade.wav", "boost.wav"]
+        
+        for sound_name in sound_names:
+            self.assets.add_sound(sound_name, os.path.join(SOUNDS_PATH, sound_name))
+        
+        # Store music track paths
+        for theme in self.themes:
+            self.music_tracks[theme] = os.path.join(SOUNDS_PATH, self.themes[theme]["music"])
+    
+    def preload_sounds(self):
+        """Queue every sound effect to be loaded on a later frame"""
+        for sound_name in self.assets.sound_paths:
+            self.assets.preload_sound(sound_name)
     
     def play_theme_music(self, theme):
         """Play background music for the specified theme"""
@@ -73,17 +59,18 @@ class AudioManager:
                 print(f"Error playing sound: {e}")
     
     def play_click_sound(self, theme):
-        """Play the click sound for the specified theme"""
-        self.play_sound(self.click_sounds.get(theme))
+        """Play the click sound for the specified theme (or the default click if it is missing)"""
+        sound = self.assets.get_sound(self.themes[theme]["click_sound"]) if theme in self.themes else None
+        self.play_sound(sound or self.assets.get_sound("default_click.wav"))
     
     def play_achievement_sound(self):
         """Play the achievement unlocked sound"""
-        self.play_sound(self.achievement_sound)
+        self.play_sound(self.assets.get_sound("achievement.wav"))
     
     def play_upgrade_sound(self):
         """Play the upgrade purchased sound"""
-        self.play_sound(self.upgrade_sound)
+        self.play_sound(self.assets.get_sound("upgrade.wav"))
     
     def play_boost_sound(self):
         """Play the boost activated sound"""
-        self.play_sound(self.boost_sound)
\ No newline at end of file
+        self.play_sound(self.assets.get_sound("boost.wav"))
\ No newline at end of file
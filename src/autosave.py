@@ -0,0 +1,83 @@
+import queue
+import threading
+import time
+
+# Seconds between periodic autosaves
+AUTOSAVE_INTERVAL = 30
+
+# Minimum seconds between saves triggered by game events, so bulk buying doesn't save every frame
+EVENT_SAVE_COOLDOWN = 2
+
+# Engine events worth saving for straight away
+SIGNIFICANT_EVENTS = ("building_purchased", "upgrade_purchased", "achievement_unlocked", "offline_progress")
+
+class AutoSaver:
+    """
+    Schedules saves periodically and after significant game events.
+    
+    The game state is always snapshotted on the calling (render) thread so
+    it is consistent, but with use_thread the disk write happens on a worker
+    thread and the frame never waits for I/O. The browser build has no
+    threads, so there the write happens inline.
+    """
+    
+    def __init__(self, save_manager, interval=AUTOSAVE_INTERVAL, use_thread=True):
+        self.save_manager = save_manager
+        self.interval = interval
+        self.last_save = time.monotonic()
+        self.save_requested = False
+        
+        # Snapshots waiting for the worker thread to write them
+        self.pending_saves = None
+        self.worker = None
+        if use_thread:
+            self.pending_saves = queue.Queue()
+            self.worker = threading.Thread(target=self.write_pending_saves, name="autosave", daemon=True)
+            self.worker.start()
+    
+    def on_engine_event(self, event, data):
+        """Engine listener that requests a save after significant events"""
+        if event in SIGNIFICANT_EVENTS:
+            self.request_save()
+    
+    def request_save(self):
+        """Ask for a save as soon as the event cooldown allows"""
+        self.save_requested = True
+    
+    def update(self):
+        """Save if the interval has elapsed or a requested save is due. Call once per frame"""
+        elapsed = time.monotonic() - self.last_save
+        
+        if elapsed >= self.interval or (self.save_requested and elapsed >= EVENT_SAVE_COOLDOWN):
+            self.save()
+    
+    def save(self):
+        """Snapshot the game now and write it (in the background when threaded)"""
+        contents = self.save_manager.serialize()
+        self.last_save = time.monotonic()
+        self.save_requested = False
+        
+        if self.worker is not None:
+            self.pending_saves.put(contents)
+        else:
+            self.save_manager.write_save(contents)
+    
+    def write_pending_saves(self):
+        """Worker thread loop that writes queued snapshots until stopped"""
+        while True:
+            contents = self.pending_saves.get()
+            if contents is None:
+                break
+            
+            # Writes must land in order: journal appends are relative to the previous save
+            self.save_manager.write_save(contents)
+    
+    def stop(self):
+        """Write a final save and wait for the worker to finish"""
+        if self.worker is not None:
+            self.pending_saves.put(None)
+            self.worker.join()
+            self.worker = None
+        
+        # The final save is written inline so it is on disk before the game exits
+        self.save_manager.save_game()
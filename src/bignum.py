@@ -0,0 +1,230 @@
+import math
+
+# Exponent gap beyond which the smaller addend no longer changes a float mantissa
+_PRECISION_DIGITS = 17
+
+# Integers at least this large are converted digit-wise instead of through float
+_LARGE_INT = 10 ** 300
+
+class BigNum:
+    """
+    Arbitrary-magnitude number stored as mantissa * 10 ** exponent.
+
+    The mantissa is a float normalized to 1 <= abs(mantissa) < 10 (or exactly
+    0) and the exponent is a Python int, so values never overflow to inf no
+    matter how far past 1e308 a save grows. Every operation is a handful of
+    float operations, which keeps per-frame production and cost math cheap.
+
+    BigNum is immutable and mixes freely with ints and floats in arithmetic
+    and comparisons.
+    """
+
+    __slots__ = ("mantissa", "exponent")
+
+    def __init__(self, value=0):
+        if isinstance(value, BigNum):
+            self.mantissa = value.mantissa
+            self.exponent = value.exponent
+        elif isinstance(value, str):
+            self._parse(value)
+        elif isinstance(value, int) and abs(value) >= _LARGE_INT:
+            # Too big for a float, so take the leading digits of the integer
+            digits = str(abs(value))
+            mantissa = int(digits[:_PRECISION_DIGITS]) / 10 ** (_PRECISION_DIGITS - 1)
+            self.mantissa = -mantissa if value < 0 else mantissa
+            self.exponent = len(digits) - 1
+        else:
+            self._set(float(value), 0)
+
+    @classmethod
+    def from_parts(cls, mantissa, exponent):
+        """Create a BigNum from an unnormalized mantissa and exponent"""
+        number = cls.__new__(cls)
+        number._set(mantissa, exponent)
+        return number
+
+    @classmethod
+    def from_log10(cls, log_value):
+        """Create the BigNum equal to 10 ** log_value"""
+        exponent = math.floor(log_value)
+        return cls.from_parts(10 ** (log_value - exponent), exponent)
+
+    def _set(self, mantissa, exponent):
+        """Store a mantissa and exponent, normalizing the mantissa into [1, 10)"""
+        if 1 <= abs(mantissa) < 10:
+            # Already normalized, which is the common case for sums and products
+            self.mantissa = mantissa
+            self.exponent = exponent
+            return
+        if mantissa == 0:
+            self.mantissa = 0.0
+            self.exponent = 0
+            return
+        if not math.isfinite(mantissa):
+            raise ValueError(f"BigNum cannot represent {mantissa}")
+
+        shift = math.floor(math.log10(abs(mantissa)))
+        if shift:
+            mantissa /= 10.0 ** shift
+            exponent += shift
+
+        # log10 can be off by one at exact powers of ten
+        if abs(mantissa) >= 10:
+            mantissa /= 10
+            exponent += 1
+        elif abs(mantissa) < 1:
+            mantissa *= 10
+            exponent -= 1
+
+        self.mantissa = mantissa
+        self.exponent = exponent
+
+    def _parse(self, text):
+        """Parse the '<mantissa>e<exponent>' form produced by str()"""
+        mantissa, _, exponent = text.strip().lower().partition("e")
+        self._set(float(mantissa), int(exponent or 0))
+
+    @staticmethod
+    def _coerce(value):
+        return value if isinstance(value, BigNum) else BigNum(value)
+
+    # Conversions
+
+    def __float__(self):
+        if self.exponent > 308:
+            return math.copysign(math.inf, self.mantissa)
+        if self.exponent < -323:
+            return 0.0
+        try:
+            return self.mantissa * 10.0 ** self.exponent
+        except OverflowError:
+            return math.copysign(math.inf, self.mantissa)
+
+    def __int__(self):
+        if self.exponent < _PRECISION_DIGITS:
+            return int(float(self))
+        return int(self.mantissa * 10 ** (_PRECISION_DIGITS - 1)) * 10 ** (self.exponent - _PRECISION_DIGITS + 1)
+
+    def __bool__(self):
+        return self.mantissa != 0
+
+    def __str__(self):
+        return f"{self.mantissa!r}e{self.exponent}"
+
+    def __repr__(self):
+        return f"BigNum('{str(self)}')"
+
+    def __format__(self, spec):
+        return format(float(self), spec) if self.exponent <= 308 else str(self)
+
+    def __reduce__(self):
+        return (BigNum, (str(self),))
+
+    def log10(self):
+        """Base-10 logarithm of the value"""
+        return self.exponent + math.log10(self.mantissa)
+
+    def floor(self):
+        """Round down to a whole number (values this large are already whole)"""
+        if self.exponent >= _PRECISION_DIGITS:
+            return self
+        return BigNum(math.floor(float(self)))
+
+    # Arithmetic
+
+    def __neg__(self):
+        number = BigNum.__new__(BigNum)
+        number.mantissa = -self.mantissa
+        number.exponent = self.exponent
+        return number
+
+    def __abs__(self):
+        return self if self.mantissa >= 0 else -self
+
+    def __add__(self, other):
+        other = self._coerce(other)
+        if not other.mantissa:
+            return self
+        if not self.mantissa:
+            return other
+
+        gap = self.exponent - other.exponent
+        if gap > _PRECISION_DIGITS:
+            return self
+        if gap < -_PRECISION_DIGITS:
+            return other
+        if gap >= 0:
+            return BigNum.from_parts(self.mantissa + other.mantissa / 10.0 ** gap, self.exponent)
+        return BigNum.from_parts(other.mantissa + self.mantissa * 10.0 ** gap, other.exponent)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self + -self._coerce(other)
+
+    def __rsub__(self, other):
+        return self._coerce(other) + -self
+
+    def __mul__(self, other):
+        if isinstance(other, (int, float)) and abs(other) < _LARGE_INT:
+            # Scaling by a plain number skips building a second BigNum
+            return BigNum.from_parts(self.mantissa * other, self.exponent)
+        other = self._coerce(other)
+        return BigNum.from_parts(self.mantissa * other.mantissa, self.exponent + other.exponent)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, (int, float)) and other and abs(other) < _LARGE_INT:
+            return BigNum.from_parts(self.mantissa / other, self.exponent)
+        other = self._coerce(other)
+        if not other.mantissa:
+            raise ZeroDivisionError("BigNum division by zero")
+        return BigNum.from_parts(self.mantissa / other.mantissa, self.exponent - other.exponent)
+
+    def __rtruediv__(self, other):
+        return self._coerce(other) / self
+
+    def __pow__(self, power):
+        if not self.mantissa:
+            return BigNum(0)
+        if self.mantissa < 0:
+            raise ValueError("BigNum only supports powers of positive numbers")
+        return BigNum.from_log10(self.log10() * power)
+
+    # Comparisons
+
+    def _compare(self, other):
+        """Return -1, 0 or 1 as self is less than, equal to or greater than other"""
+        other = self._coerce(other)
+        a, b = self.mantissa, other.mantissa
+
+        # Different signs (or zeros) are decided by the mantissas alone
+        if a <= 0 <= b or b <= 0 <= a:
+            return (a > b) - (a < b)
+
+        if self.exponent != other.exponent:
+            larger = self.exponent > other.exponent
+            # For negative numbers the larger exponent is the smaller value
+            return 1 if larger == (a > 0) else -1
+        return (a > b) - (a < b)
+
+    def __eq__(self, other):
+        if not isinstance(other, (BigNum, int, float)):
+            return NotImplemented
+        return self._compare(other) == 0
+
+    def __lt__(self, other):
+        return self._compare(other) < 0
+
+    def __le__(self, other):
+        return self._compare(other) <= 0
+
+    def __gt__(self, other):
+        return self._compare(other) > 0
+
+    def __ge__(self, other):
+        return self._compare(other) >= 0
+
+    def __hash__(self):
+        return hash(float(self)) if self.exponent <= 308 else hash((self.mantissa, self.exponent))
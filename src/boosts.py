@@ -1,26 +0,0 @@
-# Define temporary boosts with their properties
-
-BOOSTS = {
-    "golden_bufo": {
-        "active": False, 
-        "end_time": None, 
-        "multiplier": 7, 
-        "duration": 7, 
-        "description": "Golden Bufo: 7x production for 7 seconds!"
-    },
-    "bufo_rain": {
-        "active": False, 
-        "end_time": None, 
-        "multiplier": 3, 
-        "duration": 30, 
-        "description": "Bufo Rain: 3x production for 30 seconds!"
-    },
-    "super_jump": {
-        "active": False, 
-        "end_time": None, 
-        "multiplier": 10, 
-        "click_only": True, 
-        "duration": 15, 
-        "description": "Super Jump: 10x click power for 15 seconds!"
-    }
-}
\ No newline at end of file
@@ -1,60 +0,0 @@
-# Define game buildings with their properties
-
-BUILDINGS = [
-    {
-        "name": "Tadpole", 
-        "base_cost": 15, 
-        "base_production": 0.1, 
-        "owned": 0, 
-        "description": "Baby steps to bufo empire"
-    },
-    {
-        "name": "Froglet", 
-        "base_cost": 100, 
-        "base_production": 0.5, 
-        "owned": 0, 
-        "description": "Not quite a frog, not quite a bufo"
-    },
-    {
-        "name": "Bufo", 
-        "base_cost": 500, 
-        "base_production": 4, 
-        "owned": 0, 
-        "description": "The standard hopper"
-    },
-    {
-        "name": "Bufo Magnus", 
-        "base_cost": 3000, 
-        "base_production": 10, 
-        "owned": 0, 
-        "description": "A truly magnificent specimen"
-    },
-    {
-        "name": "Giant Bufo", 
-        "base_cost": 10000, 
-        "base_production": 40, 
-        "owned": 0, 
-        "description": "Size does matter"
-    },
-    {
-        "name": "Hypnobufo", 
-        "base_cost": 40000, 
-        "base_production": 100, 
-        "owned": 0, 
-        "description": "ALL GLORY TO THE HYPNOBUFO"
-    },
-    {
-        "name": "Bufo Shrine", 
-        "base_cost": 200000, 
-        "base_production": 400, 
-        "owned": 0, 
-        "description": "Worship the amphibian gods"
-    },
-    {
-        "name": "Bufo Factory", 
-        "base_cost": 1666666, 
-        "base_production": 6666, 
-        "owned": 0, 
-        "description": "Industrial bufo production"
-    }
-]
\ No newline at end of file
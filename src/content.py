@@ -0,0 +1,213 @@
+"""
+Content packs.
+
+All buildings, upgrades, achievements, boosts, themes and cheat codes are
+defined in content packs. content/base.json is the game's own content and
+is always loaded first; extra packs are JSON files (or TOML files, where
+the Python has tomllib) in the same folder, loaded in file name order on
+top of it. A pack may have any of these sections:
+
+    buildings, upgrades, achievements    lists, appended to the base lists
+    boosts, themes, cheat_codes          tables, entries added or replaced by key
+
+Saves store buildings, upgrades and achievements by position, so packs
+should only ever append to their lists. An upgrade's "building" may be a
+building index or name. A pack that fails validation is reported and
+skipped as a whole; the game cannot run without the base pack, so a
+broken base pack is an error.
+
+The merged content is compiled once into a ContentPack, along with the
+achievements of each watched stat in threshold order.
+"""
+
+import json
+import os
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+# The content folder next to the src package, wherever the game is started from
+CONTENT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "content")
+
+# The game's own content, loaded before any other pack
+BASE_PACK = "base.json"
+
+NUMBER = (int, float)
+
+# Required fields of each section's entries and their types
+BUILDING_FIELDS = {"name": str, "base_cost": NUMBER, "base_production": NUMBER, "description": str}
+UPGRADE_FIELDS = {"name": str, "cost": NUMBER, "effect": str, "value": NUMBER, "description": str}
+ACHIEVEMENT_FIELDS = {"name": str, "description": str}
+BOOST_FIELDS = {"multiplier": NUMBER, "duration": NUMBER, "description": str}
+THEME_FIELDS = {"background": str, "color": (list, tuple), "click_sound": str, "music": str}
+CHEAT_FIELDS = {"effect": str, "description": str}
+
+UPGRADE_EFFECTS = ("click_power", "building_multi", "global_multi")
+ACHIEVEMENT_TYPES = (None, "clicks", "time", "buildings", "golden_bufos")
+
+# Type of each section: lists are appended to, tables are merged by key
+SECTION_TYPES = {"buildings": list, "upgrades": list, "achievements": list,
+                 "boosts": dict, "themes": dict, "cheat_codes": dict}
+
+# Extra fields each cheat effect needs
+CHEAT_EFFECT_FIELDS = {"bufos": ("value",), "multiplier": ("value", "duration"), "unlock_all": ()}
+
+class ContentError(ValueError):
+    """A content pack entry is missing a field or has an invalid value"""
+
+def check_fields(entry, fields, where):
+    if not isinstance(entry, dict):
+        raise ContentError(f"{where}: expected a table of fields")
+    for field, field_type in fields.items():
+        if field not in entry:
+            raise ContentError(f"{where}: missing '{field}'")
+        if not isinstance(entry[field], field_type) or isinstance(entry[field], bool):
+            raise ContentError(f"{where}: '{field}' has the wrong type")
+
+class ContentPack:
+    """All game content, validated and compiled into lookup tables"""
+
+    def __init__(self):
+        self.buildings = []
+        self.upgrades = []
+        self.achievements = []
+        self.boosts = {}
+        self.themes = {}
+        self.cheat_codes = {}
+
+        # Names of the packs merged in, base first
+        self.packs = []
+
+    # Merging
+
+    def add_pack(self, name, pack):
+        """Validate a pack and merge it in; nothing is merged if any entry is invalid"""
+        if not isinstance(pack, dict):
+            raise ContentError(f"{name}: expected a table of sections")
+        for section, section_type in SECTION_TYPES.items():
+            if not isinstance(pack.get(section, section_type()), section_type):
+                raise ContentError(f"{name}: '{section}' must be a {'list' if section_type is list else 'table'}")
+
+        buildings = [self.check_building(entry, f"{name} buildings[{i}]")
+                     for i, entry in enumerate(pack.get("buildings", []))]
+
+        # Buildings are looked up (and their images named) by name, so names must be unique
+        building_names = {}
+        for i, building in enumerate(self.buildings + buildings):
+            if building["name"] in building_names:
+                raise ContentError(f"{name}: duplicate building '{building['name']}'")
+            building_names[building["name"]] = i
+        building_count = len(building_names)
+        upgrades = [self.check_upgrade(entry, building_names, building_count, f"{name} upgrades[{i}]")
+                    for i, entry in enumerate(pack.get("upgrades", []))]
+        achievements = [self.check_achievement(entry, f"{name} achievements[{i}]")
+                        for i, entry in enumerate(pack.get("achievements", []))]
+
+        boosts = {key: self.check_boost(entry, f"{name} boosts.{key}") for key, entry in pack.get("boosts", {}).items()}
+        themes = {key: self.check_theme(entry, f"{name} themes.{key}") for key, entry in pack.get("themes", {}).items()}
+        cheat_codes = {key: self.check_cheat(entry, f"{name} cheat_codes.{key}")
+                       for key, entry in pack.get("cheat_codes", {}).items()}
+
+        self.buildings.extend(buildings)
+        self.upgrades.extend(upgrades)
+        self.achievements.extend(achievements)
+        self.boosts.update(boosts)
+        self.themes.update(themes)
+        self.cheat_codes.update(cheat_codes)
+        self.packs.append(name)
+
+    def check_building(self, entry, where):
+        check_fields(entry, BUILDING_FIELDS, where)
+        return dict(entry, owned=0)
+
+    def check_upgrade(self, entry, building_names, building_count, where):
+        check_fields(entry, UPGRADE_FIELDS, where)
+        if entry["effect"] not in UPGRADE_EFFECTS:
+            raise ContentError(f"{where}: unknown effect '{entry['effect']}'")
+
+        upgrade = dict(entry, purchased=False)
+        if entry["effect"] == "building_multi":
+            building = building_names.get(entry.get("building"), entry.get("building"))
+            if not isinstance(building, int) or isinstance(building, bool) or not 0 <= building < building_count:
+                raise ContentError(f"{where}: unknown building {entry.get('building')!r}")
+            upgrade["building"] = building
+        return upgrade
+
+    def check_achievement(self, entry, where):
+        check_fields(entry, ACHIEVEMENT_FIELDS, where)
+        if entry.get("type") not in ACHIEVEMENT_TYPES:
+            raise ContentError(f"{where}: unknown type '{entry.get('type')}'")
+        if entry.get("type") != "buildings":
+            check_fields(entry, {"requirement": NUMBER}, where)
+        return dict(entry, earned=False)
+
+    def check_boost(self, entry, where):
+        check_fields(entry, BOOST_FIELDS, where)
+        return dict(entry, active=False, end_time=None)
+
+    def check_theme(self, entry, where):
+        check_fields(entry, THEME_FIELDS, where)
+        if len(entry["color"]) != 3:
+            raise ContentError(f"{where}: 'color' must be [r, g, b]")
+        return dict(entry, color=tuple(entry["color"]))
+
+    def check_cheat(self, entry, where):
+        check_fields(entry, CHEAT_FIELDS, where)
+        if entry["effect"] not in CHEAT_EFFECT_FIELDS:
+            raise ContentError(f"{where}: unknown effect '{entry['effect']}'")
+        check_fields(entry, dict.fromkeys(CHEAT_EFFECT_FIELDS[entry["effect"]], NUMBER), where)
+        return dict(entry)
+
+    # Compiled tables
+
+    def compile(self):
+        """Build the lookup tables; call once every pack is merged"""
+        # (requirement, achievement index) pairs by watched stat, in threshold order
+        self.achievements_by_stat = {}
+        for i, achievement in enumerate(self.achievements):
+            requirement = achievement.get("requirement", len(self.buildings))
+            self.achievements_by_stat.setdefault(achievement.get("type"), []).append((requirement, i))
+        for thresholds in self.achievements_by_stat.values():
+            thresholds.sort()
+
+def read_pack_file(path):
+    """Parse a JSON or TOML pack file"""
+    if path.endswith(".toml"):
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    with open(path, "r") as f:
+        return json.load(f)
+
+def pack_files(content_path):
+    """Pack files in the content folder, in load order"""
+    if not os.path.isdir(content_path):
+        return []
+    extensions = (".json", ".toml") if tomllib is not None else (".json",)
+    return [os.path.join(content_path, name) for name in sorted(os.listdir(content_path))
+            if name.endswith(extensions) and name != BASE_PACK]
+
+def load_content(content_path=CONTENT_PATH):
+    """The base pack plus every valid extra pack in content_path, compiled"""
+    content = ContentPack()
+    content.add_pack(BASE_PACK, read_pack_file(os.path.join(content_path, BASE_PACK)))
+
+    for path in pack_files(content_path):
+        try:
+            content.add_pack(os.path.basename(path), read_pack_file(path))
+            print(f"Loaded content pack {path}")
+        except (OSError, ValueError) as e:
+            print(f"Error loading content pack {path}: {e}")
+
+    content.compile()
+    return content
+
+# The process-wide content of each content folder, loaded on first use
+_content = {}
+
+def get_content(content_path=CONTENT_PATH):
+    """Return the shared game content of a content folder, loading it on first use"""
+    if content_path not in _content:
+        _content[content_path] = load_content(content_path)
+    return _content[content_path]
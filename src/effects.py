@@ -0,0 +1,138 @@
+import random
+import pygame
+
+from src.fonts import get_font
+from src.text_cache import TextCache
+
+# Default cap on live effects; past it live effects are recycled in turn for new ones
+MAX_EFFECTS = 256
+
+# Effect kinds
+TEXT = 0
+PARTICLE = 1
+
+# Downward acceleration of particles, in pixels per update
+PARTICLE_GRAVITY = 0.3
+
+class Effect:
+    """A single pooled visual effect (floating text or particle)"""
+
+    __slots__ = ("kind", "surface", "x", "y", "vx", "vy", "color", "radius", "lifetime", "creation_time")
+
+class EffectManager:
+    """
+    Manages short-lived visual effects such as floating texts and bufo particles.
+
+    Effects are slotted objects recycled through a free pool, expired effects
+    are removed by swapping with the last live one (O(1), no list shifting),
+    and the number of live effects is capped. At the cap live effects are
+    recycled in slot order, which is only roughly oldest first (swap-removes
+    reorder the slots), in exchange for no scan. Floating text surfaces come
+    from a small cache of their own, so repeated texts like "+10" are
+    rendered once. Sustained auto-clicking therefore allocates next to
+    nothing per click.
+    """
+
+    def __init__(self, max_effects=MAX_EFFECTS):
+        self.max_effects = max_effects
+        self.effects = []
+        self.pool = []
+
+        # Next slot of effects to recycle once the cap is reached
+        self.recycle_cursor = 0
+
+        # Floating text surfaces get their alpha changed when drawn, so they
+        # must not be shared with the UI's text cache
+        self.text_cache = TextCache(max_size=64)
+
+    def acquire(self, kind, x, y, lifetime):
+        """Get an effect object from the pool (or recycle a live one if at the cap)"""
+        if len(self.effects) >= self.max_effects:
+            # Recycle the slots in turn instead of scanning for the oldest effect. This is only
+            # approximately oldest first: an effect expiring at the cap swaps the last one into its slot
+            self.recycle_cursor %= len(self.effects)
+            effect = self.effects[self.recycle_cursor]
+            self.recycle_cursor += 1
+        else:
+            effect = self.pool.pop() if self.pool else Effect()
+            self.effects.append(effect)
+
+        effect.kind = kind
+        effect.x = x
+        effect.y = y
+        effect.lifetime = lifetime
+        effect.creation_time = pygame.time.get_ticks()
+        return effect
+
+    def add_floating_text(self, text, position, color=(255, 255, 255), size=24, lifetime=1.0, speed=1.0):
+        """Add a new floating text effect"""
+        effect = self.acquire(TEXT, position[0], position[1], lifetime)
+        effect.surface = self.text_cache.render(get_font(size), text, color)
+        effect.color = color
+        effect.vx = 0
+        effect.vy = -speed
+        effect.radius = 0
+
+    def add_particle(self, position, color, radius=4, velocity=(0, -2), lifetime=0.6):
+        """Add a single particle that flies off and falls under gravity"""
+        effect = self.acquire(PARTICLE, position[0], position[1], lifetime)
+        effect.surface = None
+        effect.color = color
+        effect.vx, effect.vy = velocity
+        effect.radius = radius
+
+    def add_particle_burst(self, position, color, count=4):
+        """Spray a few particles outwards from a point"""
+        for _ in range(count):
+            velocity = (random.uniform(-3, 3), random.uniform(-5, -2))
+            self.add_particle(position, color, random.randint(3, 6), velocity)
+
+    def update(self):
+        """Move live effects and recycle the expired ones"""
+        current_time = pygame.time.get_ticks()
+        effects = self.effects
+        i = 0
+
+        while i < len(effects):
+            effect = effects[i]
+            elapsed = (current_time - effect.creation_time) / 1000.0
+
+            if elapsed > effect.lifetime:
+                # Swap-remove: move the last effect into this slot
+                effects[i] = effects[-1]
+                effects.pop()
+                effect.surface = None
+                self.pool.append(effect)
+                continue
+
+            effect.x += effect.vx
+            effect.y += effect.vy
+            if effect.kind == PARTICLE:
+                effect.vy += PARTICLE_GRAVITY
+            i += 1
+
+    def get_rects(self):
+        """Screen regions covered by the live effects"""
+        rects = []
+        for effect in self.effects:
+            if effect.kind == TEXT:
+                rects.append(effect.surface.get_rect(topleft=(int(effect.x), int(effect.y))))
+            else:
+                size = effect.radius * 2 + 2
+                rects.append(pygame.Rect(int(effect.x) - effect.radius - 1, int(effect.y) - effect.radius - 1, size, size))
+        return rects
+
+    def draw(self, screen):
+        """Draw all live effects, fading them out over their lifetime"""
+        current_time = pygame.time.get_ticks()
+
+        for effect in self.effects:
+            remaining = max(0.0, 1 - (current_time - effect.creation_time) / 1000.0 / effect.lifetime)
+
+            if effect.kind == TEXT:
+                effect.surface.set_alpha(int(255 * remaining))
+                screen.blit(effect.surface, (effect.x, effect.y))
+            else:
+                # Particles shrink instead of fading
+                radius = max(1, int(effect.radius * remaining))
+                pygame.draw.circle(screen, effect.color, (int(effect.x), int(effect.y)), radius)
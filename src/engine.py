@@ -0,0 +1,365 @@
+from datetime import datetime
+
+from src.content import CONTENT_PATH, get_content
+from src.bignum import BigNum
+from src.production import ProductionModel
+from src.achievement_index import AchievementIndex
+from src.timers import TimerQueue
+from src.utils import calculate_building_cost, calculate_max_affordable
+
+class BufoEngine:
+    """
+    Headless economy simulation for BufoClicker.
+
+    The engine owns all game state (bufos, buildings, upgrades, achievements,
+    boosts and stats) and the rules that change it. It never imports pygame:
+    time only moves forward when update() is called with a delta in seconds,
+    and anything the player should see or hear is reported to listeners as
+    (event, data) notifications.
+    """
+
+    def __init__(self, content=None, content_path=CONTENT_PATH):
+        # Building, upgrade, achievement, boost and cheat definitions (see src/content.py), loaded
+        # from content_path unless a ContentPack is passed in
+        self.content = content or get_content(content_path)
+
+        # Game time in seconds, advanced by update()
+        self.time = 0.0
+
+        # Everything that happens at a point in game time (boost expiry, and timers
+        # the game schedules itself), fired by advance()
+        self.timers = TimerQueue()
+
+        # Expiry timer of each active boost
+        self.boost_expiry_timers = {}
+
+        # Game state (bufo amounts are BigNums so late-game totals never overflow)
+        self.bufos = BigNum(0)
+        self.bufos_per_second = BigNum(0)
+        self.total_bufos_earned = BigNum(0)
+        self.click_power = 1
+        self.current_theme = "forest"
+
+        # Game data
+        self.buildings = self.initialize_buildings()
+        self.upgrades = self.initialize_upgrades()
+        self.achievements = self.initialize_achievements()
+        self.boosts = self.initialize_boosts()
+
+        # Stats
+        self.stats = self.initialize_stats()
+
+        # Indexes of the upgrades not purchased yet (in menu order) and the number of achievements
+        # earned, kept up to date so the menus never scan every entry
+        self.available_upgrades = []
+        self.achievements_earned = 0
+        self.count_progress()
+
+        # Cached production rate, updated incrementally as the state changes
+        self.production = ProductionModel(self.buildings, self.upgrades, self.boosts)
+
+        # Achievements by watched stat, so a stat change only checks its next threshold
+        self.achievement_index = AchievementIndex(self.achievements, self.content.achievements_by_stat)
+
+        # Callbacks notified of game events as listener(event, data)
+        self.listeners = []
+
+    def initialize_buildings(self):
+        """Create a deep copy of buildings to avoid modifying the original"""
+        return [dict(building) for building in self.content.buildings]
+
+    def initialize_upgrades(self):
+        """Create a deep copy of upgrades to avoid modifying the original"""
+        return [dict(upgrade) for upgrade in self.content.upgrades]
+
+    def initialize_achievements(self):
+        """Create a deep copy of achievements to avoid modifying the original"""
+        return [dict(achievement) for achievement in self.content.achievements]
+
+    def initialize_boosts(self):
+        """Create a deep copy of boosts to avoid modifying the original"""
+        return {k: dict(v) for k, v in self.content.boosts.items()}
+
+    def count_progress(self):
+        """Recount available upgrades and earned achievements after their flags changed wholesale"""
+        self.available_upgrades = [index for index, upgrade in enumerate(self.upgrades) if not upgrade["purchased"]]
+        self.achievements_earned = sum(1 for achievement in self.achievements if achievement["earned"])
+
+    def initialize_stats(self):
+        """Create a fresh stats dictionary"""
+        return {
+            "clicks": 0,
+            "play_time": 0,
+            "buildings_purchased": 0,
+            "upgrades_purchased": 0,
+            "game_started": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+
+    def reset(self):
+        """Reset the game state to start a new game"""
+        self.bufos = BigNum(0)
+        self.total_bufos_earned = BigNum(0)
+        self.click_power = 1
+
+        for building in self.buildings:
+            building["owned"] = 0
+        for upgrade in self.upgrades:
+            upgrade["purchased"] = False
+        for achievement in self.achievements:
+            achievement["earned"] = False
+
+        for timer in self.boost_expiry_timers.values():
+            self.timers.cancel(timer)
+        self.boost_expiry_timers = {}
+
+        self.boosts = self.initialize_boosts()
+        self.stats = self.initialize_stats()
+        self.recalculate_production()
+        self.count_progress()
+        self.achievement_index.rebuild(self.achievements)
+
+    def add_listener(self, listener):
+        """Register a callback that receives (event, data) notifications"""
+        self.listeners.append(listener)
+
+    def notify(self, event, data=None):
+        """Send an event notification to all listeners"""
+        for listener in self.listeners:
+            listener(event, data)
+
+    def calculate_building_cost(self, building, count=1):
+        """Calculate the cost of buying count buildings based on how many are owned"""
+        return calculate_building_cost(building, count)
+
+    def calculate_max_affordable(self, building):
+        """Calculate how many of a building the current bufos can buy"""
+        return calculate_max_affordable(building, self.bufos)
+
+    def calculate_bufos_per_second(self):
+        """Return the current rate of bufo production from the cached model"""
+        return self.production.bufos_per_second
+
+    def recalculate_production(self):
+        """Rebuild the production model after the state was replaced wholesale"""
+        self.production.rebuild(self.buildings, self.upgrades, self.boosts)
+        self.bufos_per_second = self.production.bufos_per_second
+
+    def calculate_click_value(self):
+        """Calculate how many bufos a single click is worth"""
+        return self.production.click_value(self.click_power)
+
+    def earn(self, amount):
+        """Add bufos to both the current balance and the lifetime total"""
+        self.bufos += amount
+        self.total_bufos_earned += amount
+        self.check_stat_achievements(None, self.total_bufos_earned)
+
+    def click_bufo(self, count=1):
+        """Handle count clicks on the main bufo in one step and return the bufos earned"""
+        earned = self.calculate_click_value() * count
+
+        self.earn(earned)
+        self.stats["clicks"] += count
+
+        self.notify("click", earned)
+
+        # Check click achievements
+        self.check_stat_achievements("clicks", self.stats["clicks"])
+
+        return earned
+
+    def buy_building(self, index, count=1):
+        """Purchase count buildings in one step if the player can afford them all"""
+        building = self.buildings[index]
+        cost = self.calculate_building_cost(building, count)
+
+        if count > 0 and self.bufos >= cost:
+            newly_owned = building["owned"] == 0
+            self.bufos -= cost
+            building["owned"] += count
+            self.stats["buildings_purchased"] += count
+            self.production.update_building(index)
+            self.bufos_per_second = self.production.bufos_per_second
+
+            self.notify("building_purchased", (building, count))
+
+            # Check building achievements (the number of building types owned only changes on a first purchase)
+            if newly_owned:
+                self.check_stat_achievements("buildings", self.count_building_types_owned())
+
+            return True
+        return False
+
+    def buy_upgrade(self, index):
+        """Purchase an upgrade if the player can afford it"""
+        upgrade = self.upgrades[index]
+
+        if not upgrade["purchased"] and self.bufos >= upgrade["cost"]:
+            self.bufos -= upgrade["cost"]
+            upgrade["purchased"] = True
+            self.available_upgrades.remove(index)
+            self.stats["upgrades_purchased"] += 1
+
+            # Apply multiplier effects
+            self.production.apply_upgrade(upgrade)
+            self.bufos_per_second = self.production.bufos_per_second
+
+            self.notify("upgrade_purchased", upgrade)
+
+            return True
+        return False
+
+    def activate_boost(self, boost_name):
+        """Activate a boost for its full duration (restarting it if already active)"""
+        boost = self.boosts[boost_name]
+        if not boost["active"]:
+            boost["active"] = True
+            self.production.start_boost(boost)
+            self.bufos_per_second = self.production.bufos_per_second
+        self.schedule_boost_expiry(boost_name, self.time + boost["duration"])
+
+        self.notify("boost_activated", boost)
+
+    def schedule_boost_expiry(self, boost_name, end_time):
+        """(Re)set the game time at which an active boost ends"""
+        self.timers.cancel(self.boost_expiry_timers.get(boost_name))
+        self.boosts[boost_name]["end_time"] = end_time
+        self.boost_expiry_timers[boost_name] = self.timers.schedule(end_time, self.end_boost, boost_name)
+
+    def boost_time_left(self, boost):
+        """Seconds of game time left on an active boost"""
+        return max(0, boost["end_time"] - self.time)
+
+    def get_boost_timers(self):
+        """Active boosts with their remaining seconds, in a form that can be saved"""
+        return {
+            boost_name: dict(boost, end_time=None, remaining=self.boost_time_left(boost))
+            for boost_name, boost in self.boosts.items() if boost["active"]
+        }
+
+    def restore_boost_timers(self, boost_timers):
+        """Reactivate saved boosts with their remaining time (call recalculate_production afterwards)"""
+        for boost_name, saved_boost in boost_timers.items():
+            # Cheat boosts only exist while active, so recreate them from the save
+            boost = self.boosts.setdefault(boost_name, {k: v for k, v in saved_boost.items() if k != "remaining"})
+            boost["active"] = True
+            self.schedule_boost_expiry(boost_name, self.time + saved_boost["remaining"])
+
+    def end_boost(self, boost_name):
+        """Deactivate a boost whose time ran out"""
+        boost = self.boosts[boost_name]
+        self.boost_expiry_timers.pop(boost_name, None)
+        if boost["active"]:
+            boost["active"] = False
+            boost["end_time"] = None
+            self.production.end_boost(boost)
+            self.bufos_per_second = self.production.bufos_per_second
+            self.notify("boost_ended", boost)
+
+    def record_golden_bufo(self):
+        """Count a caught golden bufo in the stats"""
+        if "golden_bufos_clicked" not in self.stats:
+            self.stats["golden_bufos_clicked"] = 0
+        self.stats["golden_bufos_clicked"] += 1
+        self.check_stat_achievements("golden_bufos", self.stats["golden_bufos_clicked"])
+
+    def unlock_achievement(self, achievement):
+        """Unlock an achievement and notify listeners"""
+        if not achievement["earned"]:
+            achievement["earned"] = True
+            self.achievements_earned += 1
+            self.notify("achievement_unlocked", achievement)
+
+    def count_building_types_owned(self):
+        """How many different buildings the player owns at least one of"""
+        return sum(1 for building in self.buildings if building["owned"] > 0)
+
+    def check_stat_achievements(self, achievement_type, value):
+        """Unlock the achievements of a type that the new value of its stat reaches"""
+        for achievement in self.achievement_index.check(achievement_type, value):
+            self.unlock_achievement(achievement)
+
+    def check_achievements(self):
+        """Check every watched stat at once (after the state was replaced wholesale, e.g. on load)"""
+        self.check_stat_achievements(None, self.total_bufos_earned)
+        self.check_stat_achievements("time", self.stats["play_time"])
+        self.check_stat_achievements("clicks", self.stats["clicks"])
+        self.check_stat_achievements("buildings", self.count_building_types_owned())
+        self.check_stat_achievements("golden_bufos", self.stats.get("golden_bufos_clicked", 0))
+
+    def apply_cheat_code(self, code):
+        """Apply a cheat code's effects. Returns the cheat definition, or None if unknown"""
+        cheat = self.content.cheat_codes.get(code)
+        if cheat is None:
+            return None
+
+        if cheat["effect"] == "bufos":
+            self.earn(cheat["value"])
+
+        elif cheat["effect"] == "multiplier":
+            # Create a temporary boost, replacing any cheat boost still running
+            old_boost = self.boosts.get("cheat_boost")
+            if old_boost is not None and old_boost["active"]:
+                self.production.end_boost(old_boost)
+                self.timers.cancel(self.boost_expiry_timers.pop("cheat_boost", None))
+
+            self.boosts["cheat_boost"] = {
+                "active": False,
+                "end_time": None,
+                "multiplier": cheat["value"],
+                "duration": cheat["duration"],
+                "description": cheat["description"]
+            }
+            self.activate_boost("cheat_boost")
+
+        elif cheat["effect"] == "unlock_all":
+            for upgrade in self.upgrades:
+                upgrade["purchased"] = True
+            self.available_upgrades = []
+            self.recalculate_production()
+
+        return cheat
+
+    def advance(self, seconds):
+        """
+        Advance game time and production by seconds in one analytic step.
+
+        Production only changes when a timer fires (e.g. a boost expires), so
+        the interval is split at each timer due inside it and every piece is
+        credited at its own constant rate. The cost depends on the number of
+        timers that fire, not on the length of the interval or on how many
+        timers are pending.
+        """
+        end_time = self.time + seconds
+
+        due = self.timers.next_time()
+        while due is not None and due <= end_time:
+            if due > self.time:
+                self.earn(self.bufos_per_second * (due - self.time))
+                self.time = due
+            self.timers.run_due(due)
+            due = self.timers.next_time()
+
+        self.earn(self.bufos_per_second * (end_time - self.time))
+        self.time = end_time
+
+    def apply_offline_progress(self, seconds):
+        """Grant the production earned while the game was closed and return the bufos earned"""
+        if seconds <= 0:
+            return BigNum(0)
+
+        earned_before = self.total_bufos_earned
+        self.advance(seconds)
+        earned = self.total_bufos_earned - earned_before
+
+        self.notify("offline_progress", (seconds, earned))
+        return earned
+
+    def update(self, delta_time):
+        """Advance the simulation by delta_time seconds"""
+        # Update play time (in seconds)
+        self.stats["play_time"] += delta_time
+        self.check_stat_achievements("time", self.stats["play_time"])
+
+        # Update bufos from automatic production, boosts and achievements
+        self.advance(delta_time)
@@ -0,0 +1,13 @@
+import pygame
+
+# Loaded fonts keyed by (name, size); SysFont does a system font lookup, so each is created once
+_fonts = {}
+
+def get_font(size, name="Arial"):
+    """Return the shared font of the given size, creating it on first use"""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(name, size)
+        _fonts[key] = font
+    return font
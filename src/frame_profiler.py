@@ -0,0 +1,251 @@
+"""
+Per-frame performance profiling.
+
+Press F3 in game (or start with BUFO_PROFILE_FRAMES=1 in the environment)
+to time every phase of every frame: event handling, the update, drawing
+the main screen and menus, and presenting the frame. A HUD shows rolling
+p50/p95/p99 times per phase, how many frames went over the frame budget
+and how many memory blocks each frame allocated. F4 (or quitting while
+profiling) exports the rolling window to frame_profile.csv and
+frame_profile.json, or to the path given in BUFO_PROFILE_REPORT with
+those extensions.
+
+Like the startup trace this module does not import pygame, so the profiler
+can be used from anywhere without pulling it in.
+"""
+
+import gc
+import json
+import os
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from src.constants import FPS
+
+PROFILE_ENV_VAR = "BUFO_PROFILE_FRAMES"
+REPORT_ENV_VAR = "BUFO_PROFILE_REPORT"
+DEFAULT_REPORT_FILE = "frame_profile"
+REPORT_VERSION = 1
+
+# Frames kept for the rolling percentiles and exports (ten seconds at 60 FPS)
+FRAME_WINDOW = 600
+
+# Seconds between HUD text refreshes, so the HUD itself does not redraw every frame
+HUD_REFRESH = 0.5
+
+PERCENTILES = (50, 95, 99)
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, -(-p * len(sorted_values) // 100) - 1))
+    return sorted_values[index]
+
+def allocated_blocks():
+    """Memory blocks currently allocated by the interpreter (0 where this is not available)"""
+    getallocatedblocks = getattr(sys, "getallocatedblocks", None)
+    return getallocatedblocks() if getallocatedblocks else 0
+
+def gc_collections():
+    """Garbage collections run so far, over all generations"""
+    return sum(generation["collections"] for generation in gc.get_stats())
+
+class FrameProfiler:
+    """
+    Times the phases of each frame and keeps a rolling window of frames.
+
+    Phases may nest (a menu drawn inside the draw phase); each phase's time
+    includes the phases inside it, and a phase entered several times in a
+    frame is summed. When disabled every method returns immediately, so
+    the profiling calls can stay in the game loop permanently.
+    """
+
+    def __init__(self, enabled=False, window=FRAME_WINDOW, budget=1000 / FPS):
+        self.enabled = enabled
+        self.budget = budget
+
+        # Finished frames as dicts of work, interval (ms), allocated blocks, gc collections and phase times
+        self.frames = deque(maxlen=window)
+
+        # Phase names in the order they were first seen, for stable HUD and CSV columns
+        self.phase_names = []
+
+        # The frame being recorded
+        self.current = None
+        self.frame_start = 0.0
+        self.frame_interval = 0.0
+        self.last_frame_start = None
+        self.frame_blocks = 0
+        self.frame_collections = 0
+
+        # Totals since profiling was last enabled
+        self.frame_count = 0
+        self.dropped_frames = 0
+
+        # HUD text and when it was last refreshed
+        self.hud_lines = []
+        self.hud_time = 0.0
+
+    def toggle(self):
+        """Turn profiling on or off; turning it on starts a fresh window"""
+        self.enabled = not self.enabled
+        if self.enabled:
+            self.reset()
+        else:
+            self.current = None
+        return self.enabled
+
+    def reset(self):
+        self.frames.clear()
+        self.current = None
+        self.last_frame_start = None
+        self.frame_count = 0
+        self.dropped_frames = 0
+        self.hud_lines = []
+        self.hud_time = 0.0
+
+    def begin_frame(self):
+        """Start recording a frame. Call at the top of the game loop"""
+        if not self.enabled:
+            return
+
+        now = time.perf_counter()
+        self.current = {}
+        self.frame_start = now
+        self.frame_interval = (now - self.last_frame_start) * 1000 if self.last_frame_start is not None else 0.0
+        self.last_frame_start = now
+        self.frame_blocks = allocated_blocks()
+        self.frame_collections = gc_collections()
+
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block as a named phase of the current frame"""
+        if self.current is None:
+            yield
+            return
+
+        if name not in self.current and name not in self.phase_names:
+            self.phase_names.append(name)
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            # The profiler may have been toggled off inside the phase
+            if self.current is not None:
+                self.current[name] = self.current.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    def end_frame(self):
+        """Finish recording the current frame"""
+        if self.current is None:
+            return
+
+        work = (time.perf_counter() - self.frame_start) * 1000
+        frame = {
+            "work": work,
+            "interval": self.frame_interval,
+            "alloc_blocks": allocated_blocks() - self.frame_blocks,
+            "gc_collections": gc_collections() - self.frame_collections,
+            "phases": self.current
+        }
+        self.frames.append(frame)
+        self.current = None
+
+        self.frame_count += 1
+        if work > self.budget:
+            self.dropped_frames += 1
+
+    # Statistics
+
+    def get_percentiles(self, values):
+        """(p50, p95, p99) of a list of values"""
+        values = sorted(values)
+        return tuple(percentile(values, p) for p in PERCENTILES)
+
+    def get_summary(self):
+        """Rolling statistics over the frames in the window"""
+        frames = self.frames
+        phases = {}
+        for name in self.phase_names:
+            times = [frame["phases"].get(name, 0.0) for frame in frames]
+            phases[name] = dict(zip(("p50", "p95", "p99"), self.get_percentiles(times)))
+
+        return {
+            "frames": len(frames),
+            "budget": self.budget,
+            "work": dict(zip(("p50", "p95", "p99"), self.get_percentiles([frame["work"] for frame in frames]))),
+            "dropped": sum(1 for frame in frames if frame["work"] > self.budget),
+            "total_frames": self.frame_count,
+            "total_dropped": self.dropped_frames,
+            "alloc_blocks_per_frame": sum(frame["alloc_blocks"] for frame in frames) / len(frames) if frames else 0.0,
+            "gc_collections": sum(frame["gc_collections"] for frame in frames),
+            "phases": phases
+        }
+
+    def get_hud_lines(self):
+        """The HUD text, refreshed at most every HUD_REFRESH seconds"""
+        now = time.perf_counter()
+        if self.frames and (not self.hud_lines or now - self.hud_time >= HUD_REFRESH):
+            self.hud_time = now
+            summary = self.get_summary()
+            work = summary["work"]
+            lines = [
+                f"frame {work['p50']:5.1f} {work['p95']:5.1f} {work['p99']:5.1f} ms (p50/p95/p99)",
+                f"over {summary['budget']:.1f} ms: {summary['dropped']}/{summary['frames']} "
+                f"({summary['total_dropped']}/{summary['total_frames']} total)",
+                f"alloc {summary['alloc_blocks_per_frame']:+.0f} blocks/frame, {summary['gc_collections']} gc"
+            ]
+            for name, times in summary["phases"].items():
+                lines.append(f"{name[:18]:<18} {times['p50']:5.1f} {times['p95']:5.1f} {times['p99']:5.1f}")
+            self.hud_lines = lines
+        return self.hud_lines
+
+    # Export
+
+    def export_csv(self, path):
+        """Write one row per frame in the window"""
+        columns = ["frame", "work_ms", "interval_ms", "dropped", "alloc_blocks", "gc_collections"]
+        first = self.frame_count - len(self.frames)
+        with open(path, "w") as f:
+            f.write(",".join(columns + [f"{name}_ms" for name in self.phase_names]) + "\n")
+            for i, frame in enumerate(self.frames):
+                row = [str(first + i), f"{frame['work']:.3f}", f"{frame['interval']:.3f}",
+                       "1" if frame["work"] > self.budget else "0",
+                       str(frame["alloc_blocks"]), str(frame["gc_collections"])]
+                row.extend(f"{frame['phases'].get(name, 0.0):.3f}" for name in self.phase_names)
+                f.write(",".join(row) + "\n")
+
+    def export_json(self, path):
+        """Write the summary and every frame in the window"""
+        report = {
+            "version": REPORT_VERSION,
+            "summary": self.get_summary(),
+            "frames": list(self.frames)
+        }
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+    def export(self, path=None):
+        """Write path.csv and path.json (by default from BUFO_PROFILE_REPORT); returns the base path"""
+        if not self.frames:
+            return None
+        path = path or os.environ.get(REPORT_ENV_VAR, DEFAULT_REPORT_FILE)
+        path = os.path.splitext(path)[0]
+        try:
+            self.export_csv(path + ".csv")
+            self.export_json(path + ".json")
+        except Exception as e:
+            print(f"Error writing frame profile: {e}")
+            return None
+        print(f"Frame profile written to {path}.csv and {path}.json")
+        return path
+
+def profiling_requested():
+    """Whether frame profiling was asked for in the environment"""
+    return os.environ.get(PROFILE_ENV_VAR, "") not in ("", "0")
+
+# The process-wide profiler
+frame_profiler = FrameProfiler(profiling_requested())
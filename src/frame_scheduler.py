@@ -0,0 +1,105 @@
+import time
+
+from src.constants import FPS
+
+# Simulation steps per second while the game is in the foreground
+TICK_RATE = FPS
+
+# Seconds between loop iterations in the background, where only events are polled
+BACKGROUND_POLL_INTERVAL = 0.5
+
+# Most ticks simulated in one frame; time beyond this after a stall is handed back in one step
+MAX_CATCH_UP_TICKS = 5
+
+class FrameScheduler:
+    """
+    Fixed-timestep frame pacing.
+
+    Real time is accumulated and handed out as whole simulation ticks of a
+    fixed length, so the game behaves the same at any frame rate. After a
+    stall at most MAX_CATCH_UP_TICKS are simulated in one frame and the
+    rest is returned as a single skipped interval that the caller can
+    credit to the economy analytically. Frames are scheduled against
+    absolute deadlines, so sleeping exactly the remaining budget does not
+    drift. With vsync (the browser, where requestAnimationFrame paces the
+    loop) the scheduler never sleeps and only yields.
+
+    In the background no ticks are handed out and the loop only wakes
+    every BACKGROUND_POLL_INTERVAL seconds; the time spent there since the
+    last wake-up is returned as skipped time in one piece, so the economy
+    (and anything saved from it) stays current while nothing is simulated.
+    """
+
+    def __init__(self, tick_rate=TICK_RATE, background_poll_interval=BACKGROUND_POLL_INTERVAL,
+                 max_catch_up=MAX_CATCH_UP_TICKS, vsync=False):
+        self.tick = 1.0 / tick_rate
+        self.background_poll_interval = background_poll_interval
+        self.max_catch_up = max_catch_up
+        self.vsync = vsync
+
+        # When background time was last handed out, or None in the foreground
+        self.background_since = None
+
+        # Real time not yet simulated, and when it was last measured
+        self.accumulator = 0.0
+        self.last_time = time.perf_counter()
+
+        # When the next frame is due
+        self.next_frame = self.last_time
+
+    @property
+    def background(self):
+        return self.background_since is not None
+
+    def set_background(self, background):
+        """Enter or leave the background; leaving returns the background seconds not handed out yet"""
+        now = time.perf_counter()
+        if background and not self.background:
+            self.background_since = now
+
+        elif not background and self.background:
+            away = now - self.background_since
+            self.background_since = None
+
+            # Time in the background is handed back here, not replayed as ticks
+            self.accumulator = 0.0
+            self.last_time = now
+            self.next_frame = now
+            return away
+        return 0.0
+
+    def advance(self):
+        """Measure the real time since the last call; returns (ticks to simulate, skipped seconds)"""
+        now = time.perf_counter()
+        if self.background:
+            away = now - self.background_since
+            self.background_since = now
+            return 0, away
+
+        self.accumulator += now - self.last_time
+        self.last_time = now
+
+        tick = self.tick
+        ticks = int(self.accumulator / tick)
+        skipped = 0.0
+        if ticks > self.max_catch_up:
+            skipped = (ticks - self.max_catch_up) * tick
+            ticks = self.max_catch_up
+
+        self.accumulator -= (ticks * tick) + skipped
+        return ticks, skipped
+
+    def frame_delay(self):
+        """Seconds to sleep before the next frame is due"""
+        if self.background:
+            return self.background_poll_interval
+        if self.vsync:
+            return 0
+
+        now = time.perf_counter()
+        self.next_frame += self.tick
+
+        # Running late: start a new schedule from now rather than rushing to catch up
+        if self.next_frame < now:
+            self.next_frame = now
+        return self.next_frame - now
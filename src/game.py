@@ -2,115 +2,116 @@ import pygame
 import random
 import math
 import os
-from datetime import datetime
 
-from src.constants import WIDTH, HEIGHT, FPS, GOLD, THEMES, CHEAT_CODES, ASSETS_PATH
-from src.buildings import BUILDINGS
-from src.upgrades import UPGRADES
-from src.achievements import ACHIEVEMENTS
-from src.boosts import BOOSTS
+from src.constants import WIDTH, HEIGHT, GOLD, ASSETS_PATH, BUY_AMOUNTS, IN_BROWSER
+from src.engine import BufoEngine
 from src.ui import UI
-from src.utils import format_number, calculate_building_cost, FloatingTextManager
+from src.utils import format_number
+from src.effects import EffectManager
+from src.assets import AssetManager
+from src.atlas import ATLAS_MANIFEST
 from src.audio import AudioManager
 from src.save_manager import SaveManager
+from src.autosave import AutoSaver
+from src.startup_trace import startup_trace
+from src.frame_profiler import frame_profiler
+from src.frame_scheduler import FrameScheduler
+from src.list_view import WHEEL_SCROLL_STEP, DRAG_THRESHOLD
 import asyncio
 
+# Seconds a golden bufo stays on screen and a cheat message stays visible
+GOLDEN_BUFO_LIFETIME = 3
+CHEAT_MESSAGE_LIFETIME = 3
+
+# Sizes of the pre-scaled image variants used by the golden bufo event and the theme selector
+GOLDEN_BUFO_SIZE = (100, 100)
+THEME_THUMBNAIL_SIZE = (80, 80)
+
 class BufoClicker:
     def __init__(self):
         # Initialize pygame synchronously
-        pygame.init()
+        with startup_trace.phase("pygame.init"):
+            pygame.init()
         
         # Screen setup
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        with startup_trace.phase("display.set_mode"):
+            self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("BufoClicker")
-        self.clock = pygame.time.Clock()
         self.running = True
         
-        # Game state
-        self.bufos = 0
-        self.bufos_per_second = 0
-        self.total_bufos_earned = 0
-        self.click_power = 1
-        self.current_theme = "forest"
-        
-        # Game data
-        self.buildings = self.initialize_buildings()
-        self.upgrades = self.initialize_upgrades()
-        self.achievements = self.initialize_achievements()
-        self.boosts = self.initialize_boosts()
-        
-        # Stats
-        self.stats = {
-            "clicks": 0,
-            "play_time": 0,
-            "buildings_purchased": 0,
-            "upgrades_purchased": 0,
-            "game_started": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
+        # Fixed simulation ticks; the browser's animation frames pace the loop there
+        self.scheduler = FrameScheduler(vsync=IN_BROWSER)
+        
+        # Game state and rules live in the headless engine
+        self.engine = BufoEngine()
+        self.engine.add_listener(self.on_engine_event)
         
         # UI elements
         self._bufo_rect = pygame.Rect(WIDTH // 2 - 100, HEIGHT // 2 - 100, 200, 200)
-        self.last_update = pygame.time.get_ticks()
         self.show_buildings_menu = False
         self.show_upgrade_menu = False
         self.show_achievements = False
         self.show_stats = False
         self.show_theme_selector = False
+        self.buy_amount = BUY_AMOUNTS[0]
         self.cheat_input = ""
         self.show_cheat_box = False
         self.cheat_message = ""
-        self.cheat_message_time = 0
+        self.cheat_message_timer = None
         
-        # Golden bufo event
+        # Clicks on the main bufo this frame, credited together once all events are handled
+        self.pending_bufo_clicks = 0
+        
+        # Touch that started on a scrolling menu: where it went down and whether it became a drag
+        self.touch_start = None
+        self.touch_drag = 0
+        self.touch_dragging = False
+        
+        # Golden bufo event (end time and despawn timer are in engine game time)
         self.golden_bufo_active = False
         self.golden_bufo_rect = None
         self.golden_bufo_end_time = 0
+        self.golden_bufo_timer = None
         self.golden_bufo_boost = None
         
         # Initialize managers
-        self.floating_text_manager = FloatingTextManager()
-        self.audio_manager = AudioManager()
-        self.save_manager = SaveManager(self)
+        self.effects = EffectManager()
+        self.assets = AssetManager()
+        with startup_trace.phase("AudioManager (mixer init)"):
+            self.audio_manager = AudioManager(self.assets, self.engine.content.themes)
+        self.save_manager = SaveManager(self.engine)
+        
+        # Autosave periodically and after purchases; writes go to a worker thread on desktop
+        self.autosaver = AutoSaver(self.save_manager, use_thread=not IN_BROWSER)
+        self.engine.add_listener(self.autosaver.on_engine_event)
         
         # Debug variables
         self.debug_click_positions = []
         self.debug_mode = False  # Set to True to see debug info
         
         # Load assets first so UI can reference them
-        self.load_assets()
+        with startup_trace.phase("load_assets"):
+            self.load_assets()
         
         # Initialize UI after assets are loaded
-        self.ui = UI(self)
+        with startup_trace.phase("UI"):
+            self.ui = UI(self)
         
         # Random events
         self.last_random_event = pygame.time.get_ticks()
         
-        # Load game save and start music
-        self.audio_manager.play_theme_music(self.current_theme)
+        # Load game save, then queue the assets and music the first frame does not need
+        with startup_trace.phase("load_game"):
+            self.save_manager.load_game()
+        self.preload_assets()
     
     # Use a property to access bufo_rect to ensure it's always up to date
     @property
     def bufo_rect(self):
         return self._bufo_rect
     
-    def initialize_buildings(self):
-        """Create a deep copy of buildings to avoid modifying the original"""
-        return [dict(building) for building in BUILDINGS]
-    
-    def initialize_upgrades(self):
-        """Create a deep copy of upgrades to avoid modifying the original"""
-        return [dict(upgrade) for upgrade in UPGRADES]
-    
-    def initialize_achievements(self):
-        """Create a deep copy of achievements to avoid modifying the original"""
-        return [dict(achievement) for achievement in ACHIEVEMENTS]
-    
-    def initialize_boosts(self):
-        """Create a deep copy of boosts to avoid modifying the original"""
-        return {k: dict(v) for k, v in BOOSTS.items()}
-    
     def load_assets(self):
-        """Load all game assets"""
+        """Register all game images; they are loaded on first use or streamed in by preload_assets"""
         # Create directories if they don't exist
         os.makedirs(ASSETS_PATH, exist_ok=True)
         
@@ -119,235 +120,126 @@ class BufoClicker:
         print(f"Assets path: {ASSETS_PATH}")
         print(f"Assets folder exists: {os.path.exists(ASSETS_PATH)}")
         
-        # List files in assets directory if it exists
-        if os.path.exists(ASSETS_PATH):
-            print(f"Files in assets folder: {os.listdir(ASSETS_PATH)}")
+        # Small sprites come from the packed atlas (python -m src.atlas builds it from assets_src) in a single decode
+        atlas_path = os.path.join(ASSETS_PATH, ATLAS_MANIFEST)
+        if os.path.exists(atlas_path):
+            try:
+                self.assets.add_atlas(atlas_path)
+            except Exception as e:
+                print(f"Error reading texture atlas manifest: {e}")
+        
+        # Main and golden bufo images
+        self.add_image("bufo.png", (200, 200), (0, 180, 0), (255, 215, 0))
+        self.add_image("golden_bufo.png", (200, 200), (255, 215, 0), (0, 180, 0))
+        
+        # Building images
+        for building in self.engine.buildings:
+            self.add_image(self.building_image_name(building), (50, 50), (0, 180, 0), (255, 215, 0))
+        
+        # Background images
+        for theme in self.engine.content.themes.values():
+            self.add_image(theme["background"], (WIDTH, HEIGHT), theme["color"])
+    
+    def preload_assets(self):
+        """Queue everything the first frame does not need to stream in over the following frames"""
+        # The golden bufo appears when a boost starts, so it comes first
+        self.assets.preload_image("golden_bufo.png", (200, 200))
+        self.assets.preload_image("golden_bufo.png", GOLDEN_BUFO_SIZE)
         
-        # Load images with better error handling
-        try:
-            # Main bufo image
-            bufo_path = os.path.join(ASSETS_PATH, "bufo.png")
-            print(f"Looking for bufo image at: {bufo_path}")
-            print(f"File exists: {os.path.exists(bufo_path)}")
-            
-            if os.path.exists(bufo_path):
-                self.bufo_img = pygame.image.load(bufo_path)
-                self.bufo_img = pygame.transform.scale(self.bufo_img, (200, 200))
-            else:
-                print("Using fallback bufo image")
-                self.bufo_img = pygame.Surface((200, 200))
-                self.bufo_img.fill((0, 180, 0))
-                pygame.draw.circle(self.bufo_img, (255, 215, 0), (100, 100), 80)
-            
-            # Golden bufo image
-            golden_bufo_path = os.path.join(ASSETS_PATH, "golden_bufo.png")
-            print(f"Looking for golden bufo image at: {golden_bufo_path}")
-            print(f"File exists: {os.path.exists(golden_bufo_path)}")
-            
-            if os.path.exists(golden_bufo_path):
-                self.golden_bufo_img = pygame.image.load(golden_bufo_path)
-                self.golden_bufo_img = pygame.transform.scale(self.golden_bufo_img, (200, 200))
-            else:
-                print("Using fallback golden bufo image")
-                self.golden_bufo_img = pygame.Surface((200, 200))
-                self.golden_bufo_img.fill((255, 215, 0))
-                pygame.draw.circle(self.golden_bufo_img, (0, 180, 0), (100, 100), 80)
-            
-            # Load building images
-            self.building_imgs = {}
-            for building in self.buildings:
-                image_name = f"{building['name'].lower().replace(' ', '_')}.png"
-                image_path = os.path.join(ASSETS_PATH, image_name)
-                print(f"Looking for building image at: {image_path}")
-                print(f"File exists: {os.path.exists(image_path)}")
-                
-                if os.path.exists(image_path):
-                    img = pygame.image.load(image_path)
-                    self.building_imgs[building['name']] = pygame.transform.scale(img, (50, 50))
-                else:
-                    print(f"Using fallback image for {building['name']}")
-                    # Create a fallback colored image if missing
-                    self.building_imgs[building['name']] = pygame.Surface((50, 50))
-                    self.building_imgs[building['name']].fill((0, 180, 0))
-                    pygame.draw.circle(self.building_imgs[building['name']], (255, 215, 0), (25, 25), 20)
-            
-            # Load background images
-            self.background_imgs = {}
-            for theme in THEMES:
-                bg_path = os.path.join(ASSETS_PATH, THEMES[theme]["background"])
-                print(f"Looking for background image at: {bg_path}")
-                print(f"File exists: {os.path.exists(bg_path)}")
-                
-                if os.path.exists(bg_path):
-                    self.background_imgs[theme] = pygame.image.load(bg_path)
-                    self.background_imgs[theme] = pygame.transform.scale(self.background_imgs[theme], (WIDTH, HEIGHT))
-                else:
-                    print(f"Using fallback background for {theme}")
-                    # Create a fallback colored background if missing
-                    self.background_imgs[theme] = pygame.Surface((WIDTH, HEIGHT))
-                    self.background_imgs[theme].fill(THEMES[theme]["color"])
-                    
-        except Exception as e:
-            print(f"Error loading assets: {e}")
-            # Create fallback assets
-            self.bufo_img = pygame.Surface((200, 200))
-            self.bufo_img.fill((0, 180, 0))
-            pygame.draw.circle(self.bufo_img, (255, 215, 0), (100, 100), 80)
-            
-            self.golden_bufo_img = pygame.Surface((200, 200))
-            self.golden_bufo_img.fill((255, 215, 0))
-            pygame.draw.circle(self.golden_bufo_img, (0, 180, 0), (100, 100), 80)
-            
-            # Create fallback building images
-            self.building_imgs = {}
-            for building in self.buildings:
-                self.building_imgs[building['name']] = pygame.Surface((50, 50))
-                self.building_imgs[building['name']].fill((0, 180, 0))
-                pygame.draw.circle(self.building_imgs[building['name']], (255, 215, 0), (25, 25), 20)
-            
-            # Create fallback backgrounds
-            self.background_imgs = {}
-            for theme in THEMES:
-                self.background_imgs[theme] = pygame.Surface((WIDTH, HEIGHT))
-                self.background_imgs[theme].fill(THEMES[theme]["color"])
+        # Sounds are needed on the first click
+        self.audio_manager.preload_sounds()
+        
+        # Start the music once the first frame is on screen
+        self.assets.preload(self.audio_manager.play_theme_music, self.engine.current_theme)
+        
+        for building in self.engine.buildings:
+            self.assets.preload_image(self.building_image_name(building), (50, 50))
+        
+        for theme in self.engine.content.themes.values():
+            self.assets.preload_image(theme["background"], (WIDTH, HEIGHT))
+            self.assets.preload_image(theme["background"], THEME_THUMBNAIL_SIZE)
+    
+    def building_image_name(self, building):
+        """File name of a building's image"""
+        return f"{building['name'].lower().replace(' ', '_')}.png"
     
-    def calculate_building_cost(self, building):
-        """Calculate the cost of a building based on how many are owned"""
-        return calculate_building_cost(building)
+    def add_image(self, image_name, size, color, circle_color=None):
+        """Register an image from the assets folder, with a placeholder of the given look if it is missing"""
+        self.assets.add_image(image_name, os.path.join(ASSETS_PATH, image_name),
+                              lambda: self.make_fallback_image(size, color, circle_color))
+    
+    def make_fallback_image(self, size, color, circle_color=None):
+        """Create a placeholder image: a filled rectangle, optionally with a circle in the middle"""
+        image = pygame.Surface(size)
+        image.fill(color)
+        if circle_color:
+            pygame.draw.circle(image, circle_color, (size[0] // 2, size[1] // 2), size[0] * 2 // 5)
+        return image
+    
+    def calculate_building_cost(self, building, count=1):
+        """Calculate the cost of buying count buildings based on how many are owned"""
+        return self.engine.calculate_building_cost(building, count)
+    
+    def get_buy_count(self, building):
+        """How many of a building the selected buy amount would purchase"""
+        if self.buy_amount == "Max":
+            # Buy as many as possible, but always show at least the next one
+            return max(1, self.engine.calculate_max_affordable(building))
+        return self.buy_amount
     
     def format_number(self, num):
         """Format a number with K, M, B suffixes for readability"""
         return format_number(num)
     
-    def calculate_bufos_per_second(self):
-        """Calculate the current rate of bufo production"""
-        bps = 0
-        for building in self.buildings:
-            production = building["base_production"] * building["owned"]
-            
-            # Apply building-specific multipliers from upgrades
-            for upgrade in self.upgrades:
-                if upgrade["purchased"] and upgrade["effect"] == "building_multi" and upgrade["building"] == self.buildings.index(building):
-                    production *= upgrade["value"]
-            
-            bps += production
-        
-        # Apply global multipliers from upgrades
-        for upgrade in self.upgrades:
-            if upgrade["purchased"] and upgrade["effect"] == "global_multi":
-                bps *= upgrade["value"]
-        
-        # Apply temporary boosts
-        for boost_name, boost in self.boosts.items():
-            if boost["active"] and not boost.get("click_only", False):
-                bps *= boost["multiplier"]
-        
-        return bps
-    
     def add_floating_text(self, text, position, color=GOLD, size=24, lifetime=1.0, speed=1.0):
         """Add a floating text animation at the specified position"""
-        self.floating_text_manager.add_floating_text(text, position, color, size, lifetime, speed)
-    
-    def click_bufo(self):
-        """Handle clicking on the main bufo"""
-        click_value = self.click_power
-        
-        # Apply click power multipliers from upgrades
-        for upgrade in self.upgrades:
-            if upgrade["purchased"] and upgrade["effect"] == "click_power":
-                click_value *= upgrade["value"]
-        
-        # Apply temporary boosts
-        for boost_name, boost in self.boosts.items():
-            if boost["active"] and (boost.get("click_only", False) or not boost.get("click_only", False)):
-                click_value *= boost["multiplier"]
-        
-        self.bufos += click_value
-        self.total_bufos_earned += click_value
-        self.stats["clicks"] += 1
-        
-        # Play click sound
-        self.audio_manager.play_click_sound(self.current_theme)
-        
-        # Add floating text
-        text_pos = (self.bufo_rect.centerx + random.randint(-50, 50), 
-                    self.bufo_rect.centery + random.randint(-50, -20))
-        self.add_floating_text(f"+{self.format_number(click_value)}", text_pos, GOLD)
-        
-        # Check click achievements
-        for achievement in self.achievements:
-            if not achievement["earned"] and achievement.get("type") == "clicks":
-                if self.stats["clicks"] >= achievement["requirement"]:
-                    self.unlock_achievement(achievement)
+        self.effects.add_floating_text(text, position, color, size, lifetime, speed)
     
-    def buy_building(self, index):
-        """Purchase a building if the player can afford it"""
-        building = self.buildings[index]
-        cost = self.calculate_building_cost(building)
-        
-        if self.bufos >= cost:
-            self.bufos -= cost
-            building["owned"] += 1
-            self.stats["buildings_purchased"] += 1
-            self.bufos_per_second = self.calculate_bufos_per_second()
-            
+    def on_engine_event(self, event, data):
+        """Turn engine notifications into sounds and floating texts"""
+        if event == "click":
+            # Clicks arrive batched per frame, so this plays one sound and shows one total
+            self.audio_manager.play_click_sound(self.engine.current_theme)
+            
+            # Add floating text
+            text_pos = (self.bufo_rect.centerx + random.randint(-50, 50), 
+                        self.bufo_rect.centery + random.randint(-50, -20))
+            self.add_floating_text(f"+{self.format_number(data)}", text_pos, GOLD)
+            self.effects.add_particle_burst(text_pos, GOLD)
+        
+        elif event in ("building_purchased", "upgrade_purchased"):
             # Play upgrade sound
             self.audio_manager.play_upgrade_sound()
-            
-            # Check building achievements
-            for achievement in self.achievements:
-                if not achievement["earned"] and achievement.get("type") == "buildings":
-                    all_owned = all(b["owned"] > 0 for b in self.buildings)
-                    if all_owned:
-                        self.unlock_achievement(achievement)
-            
-            return True
-        return False
-    
-    def buy_upgrade(self, index):
-        """Purchase an upgrade if the player can afford it"""
-        upgrade = self.upgrades[index]
         
-        if not upgrade["purchased"] and self.bufos >= upgrade["cost"]:
-            self.bufos -= upgrade["cost"]
-            upgrade["purchased"] = True
-            self.stats["upgrades_purchased"] += 1
-            
-            # Apply global multiplier effects
-            if upgrade["effect"] == "global_multi" or upgrade["effect"] == "click_power" or upgrade["effect"] == "building_multi":
-                self.bufos_per_second = self.calculate_bufos_per_second()
-            
-            # Play upgrade sound
-            self.audio_manager.play_upgrade_sound()
-            
-            return True
-        return False
+        elif event == "boost_activated":
+            # Play boost sound
+            self.audio_manager.play_boost_sound()
+        
+        elif event == "offline_progress":
+            seconds, earned = data
+            self.add_floating_text(f"Welcome back! +{self.format_number(earned)} bufos while away", 
+                                 (WIDTH // 2 - 250, HEIGHT // 4), 
+                                 GOLD, 36, 5.0, 0.3)
+        
+        elif event == "achievement_unlocked":
+            self.add_floating_text(f"Achievement Unlocked: {data['name']}", 
+                                 (WIDTH // 2 - 200, HEIGHT // 4), 
+                                 GOLD, 36, 3.0, 0.5)
+            # Play achievement sound
+            self.audio_manager.play_achievement_sound()
     
     def trigger_random_event(self):
         """Trigger a random boost event"""
-        event_type = random.choice(list(self.boosts.keys()))
-        boost = self.boosts[event_type]
+        event_type = random.choice(list(self.engine.boosts.keys()))
+        boost = self.engine.boosts[event_type]
         
         if not boost["active"]:
-            boost["active"] = True
-            boost["end_time"] = pygame.time.get_ticks() + (boost["duration"] * 1000)
-            
-            # Play boost sound
-            self.audio_manager.play_boost_sound()
+            self.engine.activate_boost(event_type)
             
             # Add notification
             self.add_floating_text(boost["description"], (WIDTH // 2 - 150, HEIGHT // 2 - 50), 
                                   GOLD, 36, 3.0, 0.5)
     
-    def update_boosts(self):
-        """Update all active boosts"""
-        current_time = pygame.time.get_ticks()
-        
-        for boost_name, boost in self.boosts.items():
-            if boost["active"] and current_time >= boost["end_time"]:
-                boost["active"] = False
-                boost["end_time"] = None
-    
     def update_random_events(self):
         """Check if a random event should be triggered"""
         current_time = pygame.time.get_ticks()
@@ -372,18 +264,29 @@ class BufoClicker:
         y = random.randint(margin, HEIGHT - margin - 100)
         
         # Create a rect for the golden bufo (smaller than regular bufo)
-        self.golden_bufo_rect = pygame.Rect(x, y, 100, 100)
+        self.golden_bufo_rect = pygame.Rect((x, y), GOLDEN_BUFO_SIZE)
         
         # Choose which boost will be activated when clicked
-        self.golden_bufo_boost = random.choice(list(self.boosts.keys()))
+        self.golden_bufo_boost = random.choice(list(self.engine.boosts.keys()))
         
         # Add a floating notification
         self.add_floating_text("Golden Bufo appeared!", 
                             (WIDTH // 2 - 120, HEIGHT // 4), 
                             GOLD, 36, 2.0, 0.5)
         
-        # Set a timeout for the golden bufo (disappears after 10 seconds if not clicked)
-        self.golden_bufo_end_time = pygame.time.get_ticks() + 3000
+        # Set a timeout for the golden bufo (disappears if not clicked in time)
+        self.golden_bufo_end_time = self.engine.time + GOLDEN_BUFO_LIFETIME
+        self.golden_bufo_timer = self.engine.timers.schedule(self.golden_bufo_end_time, self.despawn_golden_bufo)
+    
+    def despawn_golden_bufo(self):
+        """Remove a golden bufo that was not clicked in time"""
+        print("Golden bufo disappeared")
+        self.golden_bufo_active = False
+        self.golden_bufo_rect = None
+        self.golden_bufo_timer = None
+        self.add_floating_text("Golden Bufo disappeared!", 
+                             (WIDTH // 2 - 120, HEIGHT // 4), 
+                             (200, 200, 200), 24, 2.0, 0.5)
         
     def activate_golden_bufo_boost(self):
         """Activate the boost associated with the clicked golden bufo"""
@@ -391,14 +294,12 @@ class BufoClicker:
         print("Golden bufo clicked! Activating boost.")
         self.golden_bufo_active = False
         self.golden_bufo_rect = None
+        self.engine.timers.cancel(self.golden_bufo_timer)
+        self.golden_bufo_timer = None
         
         # Activate the selected boost
-        boost = self.boosts[self.golden_bufo_boost]
-        boost["active"] = True
-        boost["end_time"] = pygame.time.get_ticks() + (boost["duration"] * 1000)
-        
-        # Play boost sound
-        self.audio_manager.play_boost_sound()
+        boost = self.engine.boosts[self.golden_bufo_boost]
+        self.engine.activate_boost(self.golden_bufo_boost)
         
         # Add notification
         self.add_floating_text(f"Boost activated: {boost['description']}", 
@@ -406,76 +307,24 @@ class BufoClicker:
                              GOLD, 36, 3.0, 0.5)
         
         # Add stats for golden bufos caught
-        if "golden_bufos_clicked" not in self.stats:
-            self.stats["golden_bufos_clicked"] = 0
-        self.stats["golden_bufos_clicked"] += 1
-        
-    def unlock_achievement(self, achievement):
-        """Unlock an achievement and display a notification"""
-        if not achievement["earned"]:
-            achievement["earned"] = True
-            self.add_floating_text(f"Achievement Unlocked: {achievement['name']}", 
-                                 (WIDTH // 2 - 200, HEIGHT // 4), 
-                                 GOLD, 36, 3.0, 0.5)
-            # Play achievement sound
-            self.audio_manager.play_achievement_sound()
-    
-    def check_achievements(self):
-        """Check if any achievements should be unlocked"""
-        for achievement in self.achievements:
-            if not achievement["earned"]:
-                if "type" not in achievement or achievement["type"] is None:
-                    # Bufo count achievement
-                    if self.total_bufos_earned >= achievement["requirement"]:
-                        self.unlock_achievement(achievement)
-                
-                elif achievement["type"] == "time" and self.stats["play_time"] >= achievement["requirement"]:
-                    self.unlock_achievement(achievement)
-                
-                elif achievement["type"] == "clicks" and self.stats["clicks"] >= achievement["requirement"]:
-                    self.unlock_achievement(achievement)
-                
-                elif achievement["type"] == "buildings":
-                    all_owned = all(b["owned"] > 0 for b in self.buildings)
-                    if all_owned:
-                        self.unlock_achievement(achievement)
-                
-                elif achievement["type"] == "golden_bufos" and "golden_bufos_clicked" in self.stats:
-                    if self.stats["golden_bufos_clicked"] >= achievement["requirement"]:
-                        self.unlock_achievement(achievement)
-    
+        self.engine.record_golden_bufo()
+        
     def process_cheat_code(self, code):
-        """Process a cheat code and apply its effects"""
-        if code in CHEAT_CODES:
-            cheat = CHEAT_CODES[code]
-            
-            if cheat["effect"] == "bufos":
-                self.bufos += cheat["value"]
-                self.total_bufos_earned += cheat["value"]
-                self.cheat_message = f"Cheat activated: {cheat['description']}"
-            
-            elif cheat["effect"] == "multiplier":
-                # Create a temporary boost
-                temp_boost = {
-                    "active": True,
-                    "end_time": pygame.time.get_ticks() + (cheat["duration"] * 1000),
-                    "multiplier": cheat["value"],
-                    "duration": cheat["duration"],
-                    "description": cheat["description"]
-                }
-                self.boosts["cheat_boost"] = temp_boost
-                self.cheat_message = f"Cheat activated: {cheat['description']}"
-            
-            elif cheat["effect"] == "unlock_all":
-                for upgrade in self.upgrades:
-                    upgrade["purchased"] = True
-                self.bufos_per_second = self.calculate_bufos_per_second()
-                self.cheat_message = f"Cheat activated: {cheat['description']}"
-            
-            self.cheat_message_time = pygame.time.get_ticks()
-            return True
+        """Process a cheat code and show its activation message"""
+        cheat = self.engine.apply_cheat_code(code)
         
-        return False
+        if cheat is None:
+            return False
+        
+        self.cheat_message = f"Cheat activated: {cheat['description']}"
+        self.engine.timers.cancel(self.cheat_message_timer)
+        self.cheat_message_timer = self.engine.timers.schedule(self.engine.time + CHEAT_MESSAGE_LIFETIME,
+                                                               self.clear_cheat_message)
+        return True
+    
+    def clear_cheat_message(self):
+        self.cheat_message = ""
+        self.cheat_message_timer = None
     
     def transform_coordinates(self, browser_pos):
         """
@@ -517,257 +366,203 @@ class BufoClicker:
                 self.debug_click_positions.pop(0)
             print(f"Click detected at position: {pos}")
         
-        # Check if golden bufo was clicked
+        # Check if golden bufo was clicked (it moves every spawn, so it is tested directly)
         if self.golden_bufo_active and self.golden_bufo_rect and self.golden_bufo_rect.collidepoint(pos):
             print("Golden bufo clicked!")
             self.activate_golden_bufo_boost()
             return  # Skip other processing
         
-        # Handle cheat box input if active
-        if self.show_cheat_box:
-            submit_button, cancel_button = self.ui.draw_cheat_box()
-            
-            if submit_button.collidepoint(pos):
-                print("Submit button clicked")
-                if self.process_cheat_code(self.cheat_input):
-                    self.bufos_per_second = self.calculate_bufos_per_second()
-                self.cheat_input = ""
-                self.show_cheat_box = False
-            elif cancel_button.collidepoint(pos):
-                print("Cancel button clicked")
-                self.cheat_input = ""
-                self.show_cheat_box = False
-            return  # Skip other processing
-        
-        # Handle menu interactions
-        if self.show_buildings_menu:
-            # Check building clicks
-            y_pos = 80
-            building_height = 80
-            
-            for i, building in enumerate(self.buildings):
-                building_rect = pygame.Rect(WIDTH // 2 - 300, y_pos, 600, building_height)
-                
-                if building_rect.collidepoint(pos):
-                    print(f"Building {building['name']} clicked")
-                    self.buy_building(i)
-                    break
-                
-                y_pos += building_height + 10
-            
-            # Check back button
-            back_button = pygame.Rect(WIDTH // 2 - 50, HEIGHT - 50, 100, 40)
-            if back_button.collidepoint(pos):
-                print("Back button clicked from buildings menu")
-                self.show_buildings_menu = False
-            return
-        
-        elif self.show_upgrade_menu:
-            # Check upgrade clicks - using the new available_upgrades approach
-            available_upgrades = [u for u in self.upgrades if not u["purchased"]]
-            
-            if available_upgrades:
-                upgrades_per_row = 2
-                upgrade_width = (WIDTH - 60) // upgrades_per_row
-                upgrade_height = 60
-                
-                for i, upgrade in enumerate(available_upgrades):
-                    # Calculate position - matches the UI drawing
-                    col = i % upgrades_per_row
-                    row = i // upgrades_per_row
-                    
-                    x_pos = 30 + (col * upgrade_width)
-                    y_pos = 80 + (row * (upgrade_height + 10))
-                    
-                    upgrade_rect = pygame.Rect(x_pos, y_pos, upgrade_width - 10, upgrade_height)
-                    
-                    if upgrade_rect.collidepoint(pos):
-                        print(f"Upgrade {upgrade['name']} clicked")
-                        # Find the original index in the full upgrades list
-                        original_index = self.upgrades.index(upgrade)
-                        self.buy_upgrade(original_index)
-                        break
-            
-            # Check back button
-            back_button = pygame.Rect(WIDTH // 2 - 50, HEIGHT - 50, 100, 40)
-            if back_button.collidepoint(pos):
-                print("Back button clicked from upgrades menu")
-                self.show_upgrade_menu = False
-            return
-        
-        elif self.show_achievements:
-            # Check back button
-            back_button = pygame.Rect(WIDTH // 2 - 50, HEIGHT - 50, 100, 40)
-            if back_button.collidepoint(pos):
-                print("Back button clicked from achievements menu")
-                self.show_achievements = False
-            return
-        
-        elif self.show_stats:
-            # Check back button
-            back_button = pygame.Rect(WIDTH // 2 - 50, HEIGHT - 50, 100, 40)
-            if back_button.collidepoint(pos):
-                print("Back button clicked from stats menu")
-                self.show_stats = False
-            return
-        
-        elif self.show_theme_selector:
-            # Check theme clicks
-            y_pos = 80
-            theme_height = 100
-            
-            for theme_name in THEMES:
-                theme_rect = pygame.Rect(WIDTH // 2 - 200, y_pos, 400, theme_height)
-                
-                if theme_rect.collidepoint(pos):
-                    print(f"Theme {theme_name} selected")
-                    self.current_theme = theme_name
-                    self.audio_manager.play_theme_music(self.current_theme)
-                    break
-                
-                y_pos += theme_height + 10
-            
-            # Check back button
-            back_button = pygame.Rect(WIDTH // 2 - 50, HEIGHT - 50, 100, 40)
-            if back_button.collidepoint(pos):
-                print("Back button clicked from theme selector")
-                self.show_theme_selector = False
-            return
-        
-        # If no menus are active, check main bufo
-        if self.bufo_rect.collidepoint(pos):
+        # Buttons and rows are registered by the UI as it lays out whatever is on top
+        self.ui.get_hit_index().dispatch(pos)
+    
+    def click_main_bufo(self):
+        """Count a click on the main bufo (credited in one batch at the end of the frame's events)"""
+        if self.debug_mode:
             print("Main bufo clicked!")
-            self.click_bufo()
-            return
-        
-        # Check main menu buttons
-        button_y = HEIGHT - 50
-        button_width = 150
-        button_spacing = 160
-        
-        # Buildings button (first position)
-        buildings_button = pygame.Rect(10, button_y, button_width, 40)
-        if buildings_button.collidepoint(pos):
-            print("Buildings button clicked")
-            self.show_buildings_menu = True
-            return
-        
-        # Upgrades button (second position)
-        upgrades_button = pygame.Rect(10 + button_spacing, button_y, button_width, 40)
-        if upgrades_button.collidepoint(pos):
-            print("Upgrades button clicked")
-            self.show_upgrade_menu = True
-            return
-        
-        # Achievements button (third position)
-        achievements_button = pygame.Rect(10 + button_spacing * 2, button_y, button_width, 40)
-        if achievements_button.collidepoint(pos):
-            print("Achievements button clicked")
-            self.show_achievements = True
-            return
-        
-        # Stats button (fourth position)
-        stats_button = pygame.Rect(10 + button_spacing * 3, button_y, button_width, 40)
-        if stats_button.collidepoint(pos):
-            print("Stats button clicked")
-            self.show_stats = True
-            return
-        
-        # Themes button (fifth position)
-        themes_button = pygame.Rect(10 + button_spacing * 4, button_y, button_width, 40)
-        if themes_button.collidepoint(pos):
-            print("Themes button clicked")
-            self.show_theme_selector = True
-            return
-        
-        # Cheat code button (top-right corner)
-        cheat_button = pygame.Rect(WIDTH - 50, 10, 40, 40)
-        if cheat_button.collidepoint(pos):
-            print("Cheat button clicked")
-            self.show_cheat_box = True
-            return
+        self.pending_bufo_clicks += 1
+    
+    def open_menu(self, menu):
+        """Show a menu, given the name of its show_* flag"""
+        print(f"Opening {menu}")
+        setattr(self, menu, True)
+    
+    def close_menus(self):
+        """Back button of every menu"""
+        print("Back button clicked")
+        self.show_buildings_menu = False
+        self.show_upgrade_menu = False
+        self.show_achievements = False
+        self.show_stats = False
+        self.show_theme_selector = False
+    
+    def select_buy_amount(self, amount):
+        print(f"Buy amount {amount} selected")
+        self.buy_amount = amount
+    
+    def buy_building(self, index):
+        """Buy the selected amount of a building"""
+        building = self.engine.buildings[index]
+        print(f"Building {building['name']} clicked")
+        self.engine.buy_building(index, self.get_buy_count(building))
+    
+    def buy_upgrade(self, index):
+        print(f"Upgrade {self.engine.upgrades[index]['name']} clicked")
+        self.engine.buy_upgrade(index)
+    
+    def select_theme(self, theme_name):
+        print(f"Theme {theme_name} selected")
+        self.engine.current_theme = theme_name
+        self.audio_manager.play_theme_music(self.engine.current_theme)
+        self.autosaver.request_save()
+    
+    def open_cheat_box(self):
+        print("Cheat button clicked")
+        self.show_cheat_box = True
+    
+    def submit_cheat_code(self):
+        """Apply the typed cheat code and close the cheat box"""
+        self.process_cheat_code(self.cheat_input)
+        self.cheat_input = ""
+        self.show_cheat_box = False
+    
+    def cancel_cheat_code(self):
+        self.cheat_input = ""
+        self.show_cheat_box = False
+    
+    def flush_bufo_clicks(self):
+        """Credit all of this frame's clicks on the main bufo in one engine call"""
+        if self.pending_bufo_clicks:
+            self.engine.click_bufo(self.pending_bufo_clicks)
+            self.pending_bufo_clicks = 0
     
     def handle_events(self):
         """Process user input events with better browser support"""
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            
+            # The window contents were lost (e.g. uncovered), so repaint everything
+            elif event.type == pygame.WINDOWEXPOSED:
+                self.ui.renderer.invalidate()
                 
-            # Handle both mouse clicks and touch events
-            elif event.type in (pygame.MOUSEBUTTONDOWN, pygame.FINGERDOWN, pygame.FINGERUP):
+                # Nothing else redraws a visible but unfocused window
+                if self.scheduler.background:
+                    self.draw()
+            
+            # Stop rendering while the player is looking elsewhere
+            elif event.type in (pygame.WINDOWFOCUSLOST, pygame.WINDOWHIDDEN, pygame.WINDOWMINIMIZED):
+                self.enter_background()
+            elif event.type in (pygame.WINDOWFOCUSGAINED, pygame.WINDOWSHOWN, pygame.WINDOWRESTORED):
+                self.leave_background()
+                
+            # The mouse wheel scrolls the open menu's list
+            elif event.type == pygame.MOUSEWHEEL:
+                self.ui.scroll_menu(-event.y * WHEEL_SCROLL_STEP)
+            
+            # Handle both mouse clicks and touch events. A tap also produces a FINGERUP and a
+            # mouse event emulated from the touch, so only its FINGERDOWN counts as a click
+            # (wheel notches also arrive as buttons 4 and 5, which are not clicks)
+            elif event.type == pygame.FINGERDOWN or (event.type == pygame.MOUSEBUTTONDOWN
+                                                     and not getattr(event, "touch", False)
+                                                     and event.button not in (4, 5)):
                 # Get click position based on event type
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     browser_pos = event.pos
-                else:  # FINGERDOWN or FINGERUP event
+                else:  # FINGERDOWN event
                     # For touch events, coordinates are normalized [0-1]
                     browser_pos = (event.x * WIDTH, event.y * HEIGHT)
                 
                 # Transform coordinates to account for screen scaling
                 game_pos = self.transform_coordinates(browser_pos)
                 
-                # Process the click with transformed coordinates
-                self.process_click(game_pos)
+                # On a scrolling menu a touch may be a drag, so it only clicks when released in place
+                if event.type == pygame.FINGERDOWN and self.ui.get_open_list() is not None:
+                    self.touch_start = game_pos
+                    self.touch_drag = 0
+                    self.touch_dragging = False
+                else:
+                    # Process the click with transformed coordinates
+                    self.process_click(game_pos)
+            
+            # Dragging a touch scrolls the open menu's list with the finger
+            elif event.type == pygame.FINGERMOTION and self.touch_start is not None:
+                dy = event.dy * HEIGHT
+                self.touch_drag += dy
+                if not self.touch_dragging and abs(self.touch_drag) > DRAG_THRESHOLD:
+                    # Catch up with the finger's movement so far
+                    self.touch_dragging = True
+                    dy = self.touch_drag
+                if self.touch_dragging:
+                    self.ui.scroll_menu(-dy, smooth=False)
+            
+            elif event.type == pygame.FINGERUP and self.touch_start is not None:
+                if not self.touch_dragging:
+                    self.process_click(self.touch_start)
+                self.touch_start = None
             
             elif event.type == pygame.KEYDOWN:
+                # F3 toggles the frame profiler HUD, F4 exports its frames
+                if event.key == pygame.K_F3:
+                    print(f"Frame profiler {'on' if frame_profiler.toggle() else 'off'}")
+                    self.ui.renderer.invalidate()
+                elif event.key == pygame.K_F4:
+                    frame_profiler.export()
+                
                 # Handle cheat code input
-                if self.show_cheat_box:
+                elif self.show_cheat_box:
                     if event.key == pygame.K_RETURN:
-                        if self.process_cheat_code(self.cheat_input):
-                            self.bufos_per_second = self.calculate_bufos_per_second()
-                        self.cheat_input = ""
-                        self.show_cheat_box = False
+                        self.submit_cheat_code()
                     elif event.key == pygame.K_BACKSPACE:
                         self.cheat_input = self.cheat_input[:-1]
                     elif event.key == pygame.K_ESCAPE:
-                        self.cheat_input = ""
-                        self.show_cheat_box = False
+                        self.cancel_cheat_code()
                     else:
                         # Add character to cheat input (with max length)
                         if len(self.cheat_input) < 20:
                             self.cheat_input += event.unicode
-    
-    def update(self):
-        """Update game state"""
-        current_time = pygame.time.get_ticks()
-        delta_time = (current_time - self.last_update) / 1000.0  # Convert to seconds
-        
-        # Update play time (in seconds)
-        self.stats["play_time"] += delta_time
         
-        # Update bufos from automatic production
-        self.bufos += self.bufos_per_second * delta_time
-        self.total_bufos_earned += self.bufos_per_second * delta_time
-        
-        # Update temporary boosts
-        self.update_boosts()
+        self.flush_bufo_clicks()
+    
+    def enter_background(self):
+        """Stop simulating and rendering until the game is back in the foreground"""
+        if not self.scheduler.background:
+            print("Entering background mode")
+            self.scheduler.set_background(True)
+            
+            # A hidden browser tab may be discarded without warning
+            self.autosaver.request_save()
+    
+    def leave_background(self):
+        """Credit the background time not credited yet in one analytic step and resume"""
+        if self.scheduler.background:
+            print("Leaving background mode")
+            self.engine.update(self.scheduler.set_background(False))
+            self.ui.renderer.invalidate()
+    
+    def update(self, delta_time):
+        """Update game state by one simulation tick of delta_time seconds"""
+        # Advance the economy (production, play time, achievements) and fire due timers
+        # (boost expiry, golden bufo despawn, cheat message)
+        self.engine.update(delta_time)
         
         # Check for random events
         self.update_random_events()
         
-        # Check if golden bufo has timed out
-        if self.golden_bufo_active and current_time >= self.golden_bufo_end_time:
-            print("Golden bufo disappeared")
-            self.golden_bufo_active = False
-            self.golden_bufo_rect = None
-            self.add_floating_text("Golden Bufo disappeared!", 
-                                 (WIDTH // 2 - 120, HEIGHT // 4), 
-                                 (200, 200, 200), 24, 2.0, 0.5)
-        
-        # Check achievements
-        self.check_achievements()
-        
-        # Update floating texts
-        self.floating_text_manager.update()
+        # Ease the open menu's list towards where it was scrolled
+        self.ui.update_scrolling()
         
-        self.last_update = current_time
+        # Update floating texts and particles
+        self.effects.update()
     
     def draw(self):
         """Render the game with debug overlay"""
-        # Draw main UI
-        self.ui.draw_main_ui()
+        # The main screen and any open menu only redraw and present the regions that changed
+        if not (self.show_cheat_box or self.debug_mode):
+            self.ui.draw_main_screen()
+            return
         
-        # Draw floating texts
-        self.ui.draw_floating_texts()
+        # Draw main UI (including floating texts, particles and the open menu)
+        self.ui.draw_main_ui()
         
         # Draw debugging elements if debug mode is enabled
         if self.debug_mode and self.debug_click_positions:
@@ -781,51 +576,68 @@ class BufoClicker:
             # Draw debug info for bufo rect
             pygame.draw.rect(self.screen, (0, 255, 0), self.bufo_rect, 2)
         
-        # Draw buildings menu if active
-        if self.show_buildings_menu:
-            self.ui.draw_buildings_menu()
-        
-        # Draw upgrades menu if active
-        if self.show_upgrade_menu:
-            self.ui.draw_upgrades_menu()
-        
-        # Draw achievements menu if active
-        if self.show_achievements:
-            self.ui.draw_achievements_menu()
-        
-        # Draw stats menu if active
-        if self.show_stats:
-            self.ui.draw_stats_menu()
-        
-        # Draw theme selector if active
-        if self.show_theme_selector:
-            self.ui.draw_theme_selector()
+        if self.debug_mode:
+            # Draw text cache effectiveness
+            cache_stats = self.ui.text_cache.get_stats()
+            cache_text = self.ui.render_text(
+                f"Text cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses ({cache_stats['hit_rate']:.0%})",
+                (0, 255, 0))
+            self.screen.blit(cache_text, (10, HEIGHT - 80))
         
         # Draw cheat input box if active
         if self.show_cheat_box:
-            self.ui.draw_cheat_box()
+            with frame_profiler.phase("cheat_box"):
+                self.ui.draw_cheat_box()
         
-        pygame.display.flip()
+        with frame_profiler.phase("display.flip"):
+            pygame.display.flip()
     
     async def async_run(self):
         """Async main game loop for Pygbag"""
-        while self.running:
-            # Handle events
-            self.handle_events()
-            
-            # Update game state
-            self.update()
-            
-            # Draw game
-            self.draw()
-            
-            # Allow browser to process events - using a small delay
-            # to improve responsiveness in browser environment
-            await asyncio.sleep(0.01)
-        
-        # Save game on exit
-        self.save_manager.save_game()
-        pygame.quit()
+        try:
+            while self.running:
+                frame_profiler.begin_frame()
+                
+                # Handle events
+                with frame_profiler.phase("handle_events"):
+                    self.handle_events()
+                
+                # Update game state in fixed ticks; time skipped after a stall (or spent in the
+                # background) only advances the economy
+                ticks, skipped = self.scheduler.advance()
+                with frame_profiler.phase("update"):
+                    if skipped:
+                        self.engine.update(skipped)
+                    for _ in range(ticks):
+                        self.update(self.scheduler.tick)
+                
+                # In the background nothing is drawn and assets wait until the game is back
+                if not self.scheduler.background:
+                    # Draw game
+                    with frame_profiler.phase("draw"):
+                        self.draw()
+                    startup_trace.first_frame()
+                    
+                    # Stream in queued assets within the per-frame load budget
+                    with frame_profiler.phase("assets"):
+                        self.assets.update()
+                
+                # Save periodically and after significant events
+                with frame_profiler.phase("autosave"):
+                    self.autosaver.update()
+                
+                frame_profiler.end_frame()
+                
+                # Sleep for the rest of the frame budget (or just yield to the browser)
+                await asyncio.sleep(self.scheduler.frame_delay())
+        finally:
+            # Save game on exit, even if the loop crashed, with any background time credited first
+            if self.scheduler.background:
+                self.engine.update(self.scheduler.advance()[1])
+            self.autosaver.stop()
+            if frame_profiler.enabled:
+                frame_profiler.export()
+            pygame.quit()
         
     def run(self):
         """Compatibility method for traditional Pygame"""
@@ -0,0 +1,54 @@
+import pygame
+
+# Side of the square grid cells clickable regions are bucketed into, in pixels
+HIT_CELL_SIZE = 64
+
+class HitIndex:
+    """
+    Clickable screen regions bucketed into a uniform grid.
+
+    The UI registers each button or list row with the callback it triggers
+    while it lays the screen out, so clicks always hit exactly what was
+    drawn. A click only tests the few regions sharing its grid cell, however
+    many regions the screen has. Where regions overlap the one added last
+    (drawn on top) wins.
+    """
+
+    def __init__(self, cell_size=HIT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.clear()
+
+    def clear(self):
+        # (x, y) cell -> [(order, rect, callback, args)]
+        self.cells = {}
+        self.count = 0
+
+    def add(self, rect, callback, *args):
+        """Make clicks inside rect call callback(*args)"""
+        rect = pygame.Rect(rect)
+        entry = (self.count, rect, callback, args)
+        self.count += 1
+
+        size = self.cell_size
+        for cell_x in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cell_y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                self.cells.setdefault((cell_x, cell_y), []).append(entry)
+        return rect
+
+    def find(self, pos):
+        """The topmost (callback, args) registered at pos, or None"""
+        size = self.cell_size
+        found = None
+        for entry in self.cells.get((int(pos[0]) // size, int(pos[1]) // size), ()):
+            if entry[1].collidepoint(pos) and (found is None or entry[0] > found[0]):
+                found = entry
+        return (found[2], found[3]) if found else None
+
+    def dispatch(self, pos):
+        """Call the callback registered at pos; returns whether anything was hit"""
+        found = self.find(pos)
+        if found is None:
+            return False
+        callback, args = found
+        callback(*args)
+        return True
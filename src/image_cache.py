@@ -0,0 +1,52 @@
+import pygame
+
+class ImageCache:
+    """
+    Loaded images and their scaled variants, keyed by (asset, size).
+
+    Each variant is scaled from the original image once and converted to
+    the display's pixel format (convert_alpha() for images with per-pixel
+    alpha, convert() otherwise), so drawing is a plain blit with no
+    per-frame scaling or format conversion.
+    """
+
+    def __init__(self):
+        self.originals = {}
+        self.variants = {}
+
+    def load(self, name, path):
+        """Load an image file as the original for an asset"""
+        self.add(name, pygame.image.load(path))
+
+    def add(self, name, surface):
+        """Register a surface (e.g. a generated fallback) as the original for an asset"""
+        self.originals[name] = surface
+
+        # Variants of a replaced original are stale
+        for key in [key for key in self.variants if key[0] == name]:
+            del self.variants[key]
+
+    def has(self, name):
+        return name in self.originals
+
+    def get(self, name, size=None):
+        """The asset scaled to size (or at its original size) in the display format"""
+        key = (name, tuple(size) if size else None)
+        image = self.variants.get(key)
+
+        if image is None:
+            image = self.originals[name]
+            if key[1] and image.get_size() != key[1]:
+                image = pygame.transform.scale(image, key[1])
+            image = self.convert(image)
+            self.variants[key] = image
+
+        return image
+
+    def convert(self, image):
+        """Convert an image to the display's pixel format (if there is a display yet)"""
+        if pygame.display.get_surface() is None:
+            return image
+        if image.get_flags() & pygame.SRCALPHA:
+            return image.convert_alpha()
+        return image.convert()
@@ -0,0 +1,145 @@
+import pygame
+
+# Pixels scrolled per mouse wheel notch
+WHEEL_SCROLL_STEP = 60
+
+# Share of the remaining distance to the scroll target covered each update
+SCROLL_EASING = 0.3
+
+# Pixels a touch has to move before it counts as a drag rather than a tap
+DRAG_THRESHOLD = 10
+
+SCROLLBAR_WIDTH = 6
+SCROLLBAR_COLOR = (200, 200, 200)
+
+class ListView:
+    """
+    Virtualized, scrollable list (or grid) of equally sized items.
+
+    Only the items inside the viewport are drawn. Each visible item is drawn
+    onto its own row surface, kept while its key stays the same and the
+    item stays visible, so scrolling only draws the items that scroll into
+    view. Surfaces of items that scrolled out are pooled for reuse. The cost
+    of a frame therefore depends on the height of the viewport, not on the
+    number of items.
+
+    Scrolling eases towards a target offset (mouse wheel) or follows it
+    directly (touch drag).
+    """
+
+    def __init__(self, rect, item_size, spacing=10, columns=1):
+        self.rect = pygame.Rect(rect)
+        self.item_width, self.item_height = item_size
+        self.spacing = spacing
+        self.columns = columns
+        self.count = 0
+
+        # Current and target scroll offset in pixels
+        self.scroll = 0.0
+        self.target = 0.0
+
+        # Visible items as index -> (key, surface), and surfaces free for reuse
+        self.rows = {}
+        self.pool = []
+
+    @property
+    def row_stride(self):
+        return self.item_height + self.spacing
+
+    def max_scroll(self):
+        rows = -(-self.count // self.columns)
+        return max(0, rows * self.row_stride - self.spacing - self.rect.height)
+
+    def set_count(self, count):
+        """Set the number of items, keeping the scroll offset in range"""
+        self.count = count
+        self.target = min(self.target, self.max_scroll())
+        self.scroll = min(self.scroll, self.max_scroll())
+
+    def scroll_by(self, pixels, smooth=True):
+        """Move the scroll target; without smooth the list jumps there straight away"""
+        self.target = max(0, min(self.max_scroll(), self.target + pixels))
+        if not smooth:
+            self.scroll = self.target
+
+    def update(self):
+        """Ease the scroll offset towards its target. Call once per tick"""
+        distance = self.target - self.scroll
+        if abs(distance) < 0.5:
+            self.scroll = self.target
+        else:
+            self.scroll += distance * SCROLL_EASING
+
+    def offset(self):
+        """The whole-pixel scroll offset the list is drawn at"""
+        return int(round(self.scroll))
+
+    def visible_items(self):
+        """Indexes of the items at least partly inside the viewport"""
+        offset = self.offset()
+        first_row = offset // self.row_stride
+        last_row = (offset + self.rect.height - 1) // self.row_stride
+        return range(first_row * self.columns, min(self.count, (last_row + 1) * self.columns))
+
+    def item_rect(self, index):
+        """Screen rect of an item at the current scroll offset"""
+        row, column = divmod(index, self.columns)
+        return pygame.Rect(self.rect.x + column * (self.item_width + self.spacing),
+                           self.rect.y + row * self.row_stride - self.offset(),
+                           self.item_width, self.item_height)
+
+    def draw(self, surface, hits, item_key, draw_item, on_click=None):
+        """
+        Draw the visible items onto surface and register them in hits.
+
+        draw_item(row_surface, index) draws an item at (0, 0) of its own
+        transparent surface; it is only called when the item's key
+        (item_key(index)) changed or the item just scrolled into view.
+        Clicks on an item call on_click(index).
+        """
+        rows = {}
+        surface.set_clip(self.rect)
+
+        for index in self.visible_items():
+            key = item_key(index)
+            cached = self.rows.pop(index, None)
+
+            if cached is not None and cached[0] == key:
+                row_surface = cached[1]
+            else:
+                if cached is not None:
+                    row_surface = cached[1]
+                elif self.pool:
+                    row_surface = self.pool.pop()
+                else:
+                    row_surface = pygame.Surface((self.item_width, self.item_height), pygame.SRCALPHA)
+                row_surface.fill((0, 0, 0, 0))
+                draw_item(row_surface, index)
+
+            rows[index] = (key, row_surface)
+            rect = self.item_rect(index)
+            surface.blit(row_surface, rect)
+
+            if on_click is not None:
+                visible_rect = rect.clip(self.rect)
+                if visible_rect.width and visible_rect.height:
+                    hits.add(visible_rect, on_click, index)
+
+        surface.set_clip(None)
+
+        # Items that scrolled out of view give their surfaces back to the pool
+        self.pool.extend(row_surface for key, row_surface in self.rows.values())
+        self.rows = rows
+
+        self.draw_scrollbar(surface)
+
+    def draw_scrollbar(self, surface):
+        max_scroll = self.max_scroll()
+        if not max_scroll:
+            return
+
+        content_height = max_scroll + self.rect.height
+        height = max(20, self.rect.height * self.rect.height // content_height)
+        y = self.rect.y + (self.rect.height - height) * self.offset() // max_scroll
+        pygame.draw.rect(surface, SCROLLBAR_COLOR,
+                         (self.rect.right + SCROLLBAR_WIDTH, y, SCROLLBAR_WIDTH, height), border_radius=3)
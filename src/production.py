@@ -0,0 +1,103 @@
+from src.bignum import BigNum
+
+class ProductionModel:
+    """
+    Cached bufo production rate, kept up to date incrementally.
+
+    Instead of rescanning every building and upgrade whenever something
+    changes, the model keeps the pieces of the production formula as cached
+    products and sums:
+
+        bps = sum(base_production * owned * building_multiplier) * global * boosts
+
+    Buying buildings, buying upgrades and starting or ending a boost each
+    adjust one term in O(1). rebuild() recomputes everything from scratch and
+    is only needed when the state is replaced wholesale (load, reset, cheats).
+    """
+
+    def __init__(self, buildings, upgrades, boosts):
+        self.rebuild(buildings, upgrades, boosts)
+
+    def rebuild(self, buildings, upgrades, boosts):
+        """Recompute every cached term from the full game state"""
+        self.buildings = buildings
+
+        # Multipliers from purchased upgrades
+        self.building_multipliers = [1] * len(buildings)
+        self.global_multiplier = 1
+        self.click_multiplier = 1
+
+        for upgrade in upgrades:
+            if upgrade["purchased"]:
+                self.apply_upgrade(upgrade, update_output=False)
+
+        # Output of each building type before global and boost multipliers
+        self.building_output = [
+            building["base_production"] * building["owned"] * multiplier
+            for building, multiplier in zip(buildings, self.building_multipliers)
+        ]
+        self.base_production = sum(self.building_output)
+
+        # Multipliers from active boosts
+        self.active_boosts = 0
+        self.boost_multiplier = 1
+        self.click_boost_multiplier = 1
+
+        for boost in boosts.values():
+            if boost["active"]:
+                self.start_boost(boost)
+
+    @property
+    def bufos_per_second(self):
+        """Current production rate including upgrades and boosts"""
+        return BigNum(self.base_production) * (self.global_multiplier * self.boost_multiplier)
+
+    def building_production(self, index):
+        """Production of a single unit of a building, including its upgrades"""
+        return self.buildings[index]["base_production"] * self.building_multipliers[index]
+
+    def click_value(self, click_power):
+        """Bufos earned by a single click"""
+        return click_power * self.click_multiplier * self.click_boost_multiplier
+
+    def update_building(self, index):
+        """Refresh the cached output of one building after its owned count or multiplier changed"""
+        output = self.building_production(index) * self.buildings[index]["owned"]
+        self.base_production += output - self.building_output[index]
+        self.building_output[index] = output
+
+    def apply_upgrade(self, upgrade, update_output=True):
+        """Fold a newly purchased upgrade into the cached multipliers"""
+        if upgrade["effect"] == "building_multi":
+            self.building_multipliers[upgrade["building"]] *= upgrade["value"]
+            if update_output:
+                self.update_building(upgrade["building"])
+
+        elif upgrade["effect"] == "global_multi":
+            self.global_multiplier *= upgrade["value"]
+
+        elif upgrade["effect"] == "click_power":
+            self.click_multiplier *= upgrade["value"]
+
+    def start_boost(self, boost):
+        """Fold a boost that just became active into the cached multipliers"""
+        self.active_boosts += 1
+
+        # Every boost affects clicks, only non click-only boosts affect production
+        self.click_boost_multiplier *= boost["multiplier"]
+        if not boost.get("click_only", False):
+            self.boost_multiplier *= boost["multiplier"]
+
+    def end_boost(self, boost):
+        """Remove a boost that just expired from the cached multipliers"""
+        self.active_boosts -= 1
+
+        if self.active_boosts == 0:
+            # Reset exactly so repeated divisions never accumulate rounding error
+            self.boost_multiplier = 1
+            self.click_boost_multiplier = 1
+            return
+
+        self.click_boost_multiplier /= boost["multiplier"]
+        if not boost.get("click_only", False):
+            self.boost_multiplier /= boost["multiplier"]
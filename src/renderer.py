@@ -0,0 +1,177 @@
+import pygame
+
+from src.constants import WIDTH, HEIGHT
+from src.frame_profiler import frame_profiler
+
+# Past this many separate dirty regions (or this share of the screen) a full redraw is cheaper
+MAX_DIRTY_RECTS = 16
+MAX_DIRTY_AREA = 0.5
+
+class DirtyRectRenderer:
+    """
+    Retained-mode renderer for the main game screen.
+
+    The screen is split into a static background layer (theme background,
+    bufo and buttons, rebuilt only when its key changes) and widgets drawn
+    on top of it. Each frame the UI re-declares its widgets with a key
+    describing their content; widgets whose key or rect changed since the
+    last frame, plus transient regions such as moving effects, become dirty
+    rectangles. Only those regions are restored from the background,
+    redrawn and sent to the display with pygame.display.update(rects), so
+    an idle frame draws and presents nothing at all.
+    """
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.screen_rect = screen.get_rect()
+
+        # Static layer and the key it was built for
+        self.background = None
+        self.background_key = None
+
+        # Optional full-screen layer drawn over everything (an open menu)
+        self.overlay = None
+        self.overlay_key = None
+
+        # Widgets and transient regions of the last presented frame and the one being built
+        self.widgets = {}
+        self.frame_widgets = {}
+        self.transient_rects = []
+        self.frame_transient_rects = []
+        self.transient_draws = []
+
+        # Set whenever something else drew over the screen
+        self.full_redraw = True
+
+    def invalidate(self):
+        """Force the next present() to redraw the whole screen"""
+        self.full_redraw = True
+
+    def set_background(self, key, build):
+        """Use the static layer built by build(), rebuilding it only when key changes"""
+        if key != self.background_key or self.background is None:
+            self.background = build()
+            self.background_key = key
+            self.full_redraw = True
+
+    def set_overlay(self, key, surface):
+        """Draw surface over the whole frame (None for no overlay); a new key redraws everything"""
+        if key != self.overlay_key:
+            self.full_redraw = True
+        self.overlay = surface
+        self.overlay_key = key
+
+    def add(self, name, key, rect, draw):
+        """Declare a widget for this frame; draw(screen) must stay inside rect"""
+        self.frame_widgets[name] = (key, rect, draw)
+
+    def blit(self, name, surface, position):
+        """Declare a widget that is a single surface blit"""
+        rect = surface.get_rect(topleft=position)
+        self.add(name, surface, rect, lambda screen: screen.blit(surface, rect))
+
+    def add_transient(self, rects, draw):
+        """Declare content that changes every frame (e.g. moving effects) covering rects"""
+        self.frame_transient_rects.extend(rects)
+        self.transient_draws.append(draw)
+
+    def collect_dirty_rects(self):
+        """Regions that changed since the last frame, merged so that none overlap"""
+        rects = list(self.transient_rects)
+        rects.extend(self.frame_transient_rects)
+
+        for name, (key, rect, draw) in self.frame_widgets.items():
+            previous = self.widgets.get(name)
+            if previous is None:
+                rects.append(rect)
+            elif previous[0] != key or previous[1] != rect:
+                rects.append(previous[1])
+                rects.append(rect)
+
+        # Widgets that disappeared leave their old region behind
+        for name, (key, rect, draw) in self.widgets.items():
+            if name not in self.frame_widgets:
+                rects.append(rect)
+
+        return self.merge_rects(rects)
+
+    def merge_rects(self, rects):
+        """Clip rects to the screen and union overlapping ones"""
+        merged = []
+        for rect in rects:
+            rect = rect.clip(self.screen_rect)
+            if not rect.width or not rect.height:
+                continue
+
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect = rect.union(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
+    def draw_widgets(self, clip=None):
+        """Draw the widgets, optionally only those touching clip"""
+        for key, rect, draw in self.frame_widgets.values():
+            if clip is None or rect.colliderect(clip):
+                draw(self.screen)
+
+    def draw_transients(self):
+        for draw in self.transient_draws:
+            draw(self.screen)
+
+    def draw_full(self):
+        """Draw every layer of the frame onto the screen"""
+        self.screen.blit(self.background, (0, 0))
+        self.draw_widgets()
+        self.draw_transients()
+        if self.overlay is not None:
+            self.screen.blit(self.overlay, (0, 0))
+
+    def render_full(self):
+        """Draw the whole frame without presenting it (other layers will be drawn on top)"""
+        self.draw_full()
+        self.end_frame()
+
+        # Whatever is drawn over this frame has to be erased by a full redraw later
+        self.full_redraw = True
+
+    def present(self):
+        """Redraw the dirty regions of the frame and push them to the display"""
+        dirty = self.collect_dirty_rects()
+        dirty_area = sum(rect.width * rect.height for rect in dirty)
+
+        if (self.full_redraw or len(dirty) > MAX_DIRTY_RECTS
+                or dirty_area > MAX_DIRTY_AREA * WIDTH * HEIGHT):
+            self.draw_full()
+            with frame_profiler.phase("display.flip"):
+                pygame.display.flip()
+            self.full_redraw = False
+
+        elif dirty:
+            for rect in dirty:
+                # Clipping keeps unchanged widgets from being blended over themselves
+                self.screen.set_clip(rect)
+                self.screen.blit(self.background, rect, rect)
+                self.draw_widgets(rect)
+            self.screen.set_clip(None)
+
+            # Transient content lies entirely inside the dirty rects, so it is drawn once, unclipped
+            self.draw_transients()
+
+            if self.overlay is not None:
+                for rect in dirty:
+                    self.screen.blit(self.overlay, rect, rect)
+            with frame_profiler.phase("display.flip"):
+                pygame.display.update(dirty)
+
+        self.end_frame()
+        return dirty
+
+    def end_frame(self):
+        """Retain this frame's widgets for comparison and start a new frame"""
+        self.widgets = self.frame_widgets
+        self.frame_widgets = {}
+        self.transient_rects = self.frame_transient_rects
+        self.frame_transient_rects = []
+        self.transient_draws = []
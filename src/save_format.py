@@ -0,0 +1,319 @@
+"""
+Compact binary save format.
+
+A save is a full snapshot file plus an append-only journal of changes made
+since that snapshot. Both only contain mutable state: owned counts,
+purchased/earned bitsets, balances, stats and running boosts. Static data
+such as names and descriptions comes from the game definitions.
+
+Snapshot:  header, checkpoint, theme, game_started, owned counts,
+           upgrade bitset, achievement bitset, boosts
+Journal:   header, then records of (type byte, payload). Each autosave ends
+           its records with a checkpoint, and records after the last
+           complete checkpoint (a torn write) are ignored.
+
+The header carries a generation number. A journal only applies to the
+snapshot with the same generation, so a crash between writing a new
+snapshot and resetting the journal cannot replay stale changes.
+"""
+
+import struct
+
+from src.bignum import BigNum
+
+SAVE_VERSION = 2
+
+SNAPSHOT_MAGIC = b"BUFO"
+JOURNAL_MAGIC = b"BUFJ"
+
+HEADER = struct.Struct("<4sHI")                 # magic, version, generation
+CHECKPOINT = struct.Struct("<dqdqdd QdQQq")     # bufos, total earned, click power, saved_at, stats
+COUNT = struct.Struct("<H")
+OWNED = struct.Struct("<Q")
+BOOST = struct.Struct("<dddB")                  # remaining, multiplier, duration, click_only
+
+# Journal record types
+RECORD_CHECKPOINT = 1
+RECORD_BUILDING = 2
+RECORD_UPGRADE = 3
+RECORD_ACHIEVEMENT = 4
+RECORD_THEME = 5
+RECORD_BOOSTS = 6
+
+BUILDING_RECORD = struct.Struct("<HQ")          # index, owned
+FLAG_RECORD = struct.Struct("<HB")              # index, purchased/earned
+
+class SaveFormatError(Exception):
+    """Raised when save data is not in a format this version can read"""
+
+def empty_state():
+    """A save state with nothing owned, used as the base journals apply to"""
+    return {
+        "version": SAVE_VERSION,
+        "bufos": BigNum(0),
+        "total_bufos_earned": BigNum(0),
+        "click_power": 1,
+        "saved_at": None,
+        "current_theme": "forest",
+        "owned": [],
+        "upgrades": [],
+        "achievements": [],
+        "stats": {},
+        "boosts": {}
+    }
+
+# Low level encoding
+
+def encode_string(text):
+    data = text.encode("utf-8")
+    return COUNT.pack(len(data)) + data
+
+def decode_string(data, offset):
+    (length,) = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    return data[offset:offset + length].decode("utf-8"), offset + length
+
+def encode_bitset(flags):
+    bits = bytearray((len(flags) + 7) // 8)
+    for index, flag in enumerate(flags):
+        if flag:
+            bits[index // 8] |= 1 << (index % 8)
+    return COUNT.pack(len(flags)) + bytes(bits)
+
+def decode_bitset(data, offset):
+    (count,) = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    bits = data[offset:offset + (count + 7) // 8]
+    flags = [bool(bits[index // 8] & (1 << (index % 8))) for index in range(count)]
+    return flags, offset + len(bits)
+
+def encode_checkpoint(state):
+    stats = state["stats"]
+    return CHECKPOINT.pack(
+        state["bufos"].mantissa, state["bufos"].exponent,
+        state["total_bufos_earned"].mantissa, state["total_bufos_earned"].exponent,
+        state["click_power"], state["saved_at"] or 0.0,
+        int(stats.get("clicks", 0)), stats.get("play_time", 0),
+        int(stats.get("buildings_purchased", 0)), int(stats.get("upgrades_purchased", 0)),
+        int(stats.get("golden_bufos_clicked", -1))
+    )
+
+def decode_checkpoint(data, offset, state):
+    (bufos_m, bufos_e, total_m, total_e, click_power, saved_at,
+     clicks, play_time, buildings_purchased, upgrades_purchased, golden) = CHECKPOINT.unpack_from(data, offset)
+
+    state["bufos"] = BigNum.from_parts(bufos_m, bufos_e)
+    state["total_bufos_earned"] = BigNum.from_parts(total_m, total_e)
+    state["click_power"] = int(click_power) if click_power.is_integer() else click_power
+    state["saved_at"] = saved_at
+
+    stats = state["stats"]
+    stats["clicks"] = clicks
+    stats["play_time"] = play_time
+    stats["buildings_purchased"] = buildings_purchased
+    stats["upgrades_purchased"] = upgrades_purchased
+    if golden >= 0:
+        stats["golden_bufos_clicked"] = golden
+    return offset + CHECKPOINT.size
+
+def encode_boosts(boosts):
+    data = COUNT.pack(len(boosts))
+    for boost_name, boost in boosts.items():
+        data += encode_string(boost_name)
+        data += BOOST.pack(boost["remaining"], boost["multiplier"], boost["duration"], boost.get("click_only", False))
+        data += encode_string(boost.get("description", ""))
+    return data
+
+def decode_boosts(data, offset):
+    boosts = {}
+    (count,) = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    for _ in range(count):
+        boost_name, offset = decode_string(data, offset)
+        remaining, multiplier, duration, click_only = BOOST.unpack_from(data, offset)
+        offset += BOOST.size
+        description, offset = decode_string(data, offset)
+        boosts[boost_name] = {
+            "active": True,
+            "end_time": None,
+            "remaining": remaining,
+            "multiplier": multiplier,
+            "duration": duration,
+            "description": description
+        }
+        if click_only:
+            boosts[boost_name]["click_only"] = True
+    return boosts, offset
+
+def read_header(data, magic):
+    """Return (version, generation) from a snapshot or journal header"""
+    if len(data) < HEADER.size:
+        raise SaveFormatError("Save data is truncated")
+    found_magic, version, generation = HEADER.unpack_from(data, 0)
+    if found_magic != magic:
+        raise SaveFormatError("Not a BufoClicker save")
+    if version > SAVE_VERSION:
+        raise SaveFormatError(f"Save version {version} is newer than this game ({SAVE_VERSION})")
+    return version, generation
+
+# Snapshots
+
+def encode_snapshot(state, generation):
+    """Encode a full save state"""
+    parts = [
+        HEADER.pack(SNAPSHOT_MAGIC, SAVE_VERSION, generation),
+        encode_checkpoint(state),
+        encode_string(state["current_theme"]),
+        encode_string(state["stats"].get("game_started", "")),
+        COUNT.pack(len(state["owned"])),
+    ]
+    parts.extend(OWNED.pack(owned) for owned in state["owned"])
+    parts.append(encode_bitset(state["upgrades"]))
+    parts.append(encode_bitset(state["achievements"]))
+    parts.append(encode_boosts(state["boosts"]))
+    return b"".join(parts)
+
+def decode_snapshot(data):
+    """Decode a snapshot into (state, generation)"""
+    version, generation = read_header(data, SNAPSHOT_MAGIC)
+    state = empty_state()
+    state["version"] = version
+
+    try:
+        offset = decode_checkpoint(data, HEADER.size, state)
+        state["current_theme"], offset = decode_string(data, offset)
+        state["stats"]["game_started"], offset = decode_string(data, offset)
+
+        (count,) = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        state["owned"] = [OWNED.unpack_from(data, offset + i * OWNED.size)[0] for i in range(count)]
+        offset += count * OWNED.size
+
+        state["upgrades"], offset = decode_bitset(data, offset)
+        state["achievements"], offset = decode_bitset(data, offset)
+        state["boosts"], offset = decode_boosts(data, offset)
+    except (struct.error, UnicodeDecodeError) as e:
+        raise SaveFormatError(f"Corrupt snapshot: {e}")
+
+    return state, generation
+
+# Journal
+
+def encode_journal_header(generation):
+    return HEADER.pack(JOURNAL_MAGIC, SAVE_VERSION, generation)
+
+def encode_changes(old_state, new_state):
+    """Encode the journal records that turn old_state into new_state"""
+    records = []
+
+    for index, owned in enumerate(new_state["owned"]):
+        if index >= len(old_state["owned"]) or old_state["owned"][index] != owned:
+            records.append(bytes([RECORD_BUILDING]) + BUILDING_RECORD.pack(index, owned))
+
+    for record_type, key in ((RECORD_UPGRADE, "upgrades"), (RECORD_ACHIEVEMENT, "achievements")):
+        for index, flag in enumerate(new_state[key]):
+            if index >= len(old_state[key]) or old_state[key][index] != flag:
+                records.append(bytes([record_type]) + FLAG_RECORD.pack(index, flag))
+
+    if new_state["current_theme"] != old_state["current_theme"]:
+        records.append(bytes([RECORD_THEME]) + encode_string(new_state["current_theme"]))
+
+    if new_state["boosts"] or old_state["boosts"]:
+        records.append(bytes([RECORD_BOOSTS]) + encode_boosts(new_state["boosts"]))
+
+    # The checkpoint always comes last and marks the batch as complete
+    records.append(bytes([RECORD_CHECKPOINT]) + encode_checkpoint(new_state))
+    return b"".join(records)
+
+def apply_journal(state, data, generation):
+    """
+    Apply journal records to a snapshot state in place.
+
+    Returns False if the journal belongs to a different snapshot generation
+    (and was ignored). Records after the last complete checkpoint are dropped.
+    """
+    try:
+        version, journal_generation = read_header(data, JOURNAL_MAGIC)
+    except SaveFormatError:
+        return False
+    if journal_generation != generation:
+        return False
+
+    pending = []
+    offset = HEADER.size
+    try:
+        while offset < len(data):
+            record_type = data[offset]
+            offset += 1
+
+            if record_type == RECORD_CHECKPOINT:
+                # Commit the batch this checkpoint completes
+                offset = decode_checkpoint(data, offset, state)
+                for key, index, value in pending:
+                    if index is None:
+                        state[key] = value
+                    else:
+                        set_item(state[key], index, value)
+                pending = []
+
+            elif record_type == RECORD_BUILDING:
+                index, owned = BUILDING_RECORD.unpack_from(data, offset)
+                offset += BUILDING_RECORD.size
+                pending.append(("owned", index, owned))
+
+            elif record_type in (RECORD_UPGRADE, RECORD_ACHIEVEMENT):
+                index, flag = FLAG_RECORD.unpack_from(data, offset)
+                offset += FLAG_RECORD.size
+                key = "upgrades" if record_type == RECORD_UPGRADE else "achievements"
+                pending.append((key, index, bool(flag)))
+
+            elif record_type == RECORD_THEME:
+                theme, offset = decode_string(data, offset)
+                pending.append(("current_theme", None, theme))
+
+            elif record_type == RECORD_BOOSTS:
+                boosts, offset = decode_boosts(data, offset)
+                pending.append(("boosts", None, boosts))
+
+            else:
+                # Unknown record, most likely a torn write; nothing after it can be trusted
+                break
+    except (struct.error, IndexError, UnicodeDecodeError):
+        # Truncated final record from a crash mid-append
+        pass
+
+    return True
+
+def set_item(items, index, value):
+    """Set items[index], growing the list with empty values (0 or False) if needed"""
+    if index >= len(items):
+        items.extend([type(value)()] * (index + 1 - len(items)))
+    items[index] = value
+
+# Migrations from older save versions
+
+def migrate_v1(save_data):
+    """Version 1 saves were JSON dumps of the full building, upgrade and achievement dicts"""
+    state = empty_state()
+    state["bufos"] = BigNum(save_data.get("bufos", 0))
+    state["total_bufos_earned"] = BigNum(save_data.get("total_bufos_earned", 0))
+    state["click_power"] = save_data.get("click_power", 1)
+    state["current_theme"] = save_data.get("current_theme", "forest")
+    state["saved_at"] = save_data.get("saved_at")
+    state["owned"] = [building.get("owned", 0) for building in save_data.get("buildings", [])]
+    state["upgrades"] = [upgrade.get("purchased", False) for upgrade in save_data.get("upgrades", [])]
+    state["achievements"] = [achievement.get("earned", False) for achievement in save_data.get("achievements", [])]
+    state["stats"] = dict(save_data.get("stats", {}))
+    state["boosts"] = save_data.get("boosts", {})
+    return state
+
+# Functions that upgrade a state of the given version to the next one
+MIGRATIONS = {
+    1: migrate_v1
+}
+
+def migrate(state):
+    """Bring a decoded state of any older version up to SAVE_VERSION"""
+    while state.get("version", 1) < SAVE_VERSION:
+        state = MIGRATIONS[state.get("version", 1)](state)
+    return state
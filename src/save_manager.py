@@ -1,121 +1,222 @@
 import json
 import os
-from datetime import datetime
+import threading
+import time
+
+from src.save_format import (encode_snapshot, decode_snapshot, encode_changes, apply_journal,
+                             encode_journal_header, migrate)
+
+# Once the journal grows past this many bytes the next save writes a fresh snapshot
+JOURNAL_COMPACT_SIZE = 4096
 
 class SaveManager:
-    """Handles saving and loading game state"""
-    
-    def __init__(self, game):
-        self.game = game
-        self.save_file = "save.json"
-    
-    def save_game(self):
-        """Save the current game state to a file"""
-        save_data = {
-            "bufos": self.game.bufos,
-            "total_bufos_earned": self.game.total_bufos_earned,
-            "click_power": self.game.click_power,
-            "current_theme": self.game.current_theme,
-            "buildings": self.game.buildings,
-            "upgrades": self.game.upgrades,
-            "achievements": self.game.achievements,
-            "stats": self.game.stats
+    """
+    Handles saving and loading game state.
+
+    Saves use the compact binary format from src.save_format: a snapshot
+    file plus an append-only journal, so most autosaves only append the few
+    bytes that changed. JSON saves from older versions are still loaded
+    and migrated.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.save_file = "save.bufo"
+        self.legacy_save_file = "save.json"
+
+        # The snapshot generation on disk and the state the files currently add up to
+        self.generation = 0
+        self.journal_size = 0
+        self.last_saved_state = None
+
+        # Set when a write fails (possibly on the autosave thread); the next serialize() answers it
+        # with a fresh snapshot. Journal records queued behind the failure are dropped, since they
+        # were encoded against state that never reached the disk.
+        self.write_failed = threading.Event()
+        self.failed_generation = None
+
+    @property
+    def journal_file(self):
+        return self.save_file + ".journal"
+
+    def build_save_data(self):
+        """Snapshot the mutable game state in the compact save layout"""
+        return {
+            "bufos": self.engine.bufos,
+            "total_bufos_earned": self.engine.total_bufos_earned,
+            "click_power": self.engine.click_power,
+            "saved_at": time.time(),
+            "current_theme": self.engine.current_theme,
+            "owned": [building["owned"] for building in self.engine.buildings],
+            "upgrades": [upgrade["purchased"] for upgrade in self.engine.upgrades],
+            "achievements": [achievement["earned"] for achievement in self.engine.achievements],
+            "stats": dict(self.engine.stats),
+            "boosts": self.engine.get_boost_timers()
         }
-        
+
+    def serialize(self):
+        """
+        Snapshot the current game state as a pending write.
+
+        Returns (kind, generation, data) where kind is "snapshot" for a full
+        save or "journal" for records to append. Must be called on the thread
+        that owns the engine; the write itself can happen anywhere.
+        """
+        state = self.build_save_data()
+
+        if self.write_failed.is_set():
+            self.write_failed.clear()
+            self.last_saved_state = None
+
+        if self.last_saved_state is None or self.journal_size >= JOURNAL_COMPACT_SIZE:
+            self.generation += 1
+            self.journal_size = 0
+            contents = ("snapshot", self.generation, encode_snapshot(state, self.generation))
+        else:
+            changes = encode_changes(self.last_saved_state, state)
+            self.journal_size += len(changes)
+            contents = ("journal", self.generation, changes)
+
+        self.last_saved_state = state
+        return contents
+
+    def write_file_atomic(self, path, data):
+        """
+        Write a file atomically.
+
+        The data goes to a temporary file that is flushed to disk and then
+        renamed over the real file, so a crash mid-write leaves the previous
+        version intact instead of a truncated one.
+        """
+        temp_file = path + ".tmp"
+        with open(temp_file, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, path)
+
+    def write_save(self, contents):
+        """Write the result of serialize() to disk. Safe to call from a worker thread"""
+        kind, generation, data = contents
+        if kind == "journal" and generation == self.failed_generation:
+            return False
+
         try:
-            with open(self.save_file, "w") as f:
-                json.dump(save_data, f)
+            if kind == "snapshot":
+                # A new snapshot starts a new, empty journal for its generation
+                self.write_file_atomic(self.save_file, data)
+                self.write_file_atomic(self.journal_file, encode_journal_header(generation))
+            else:
+                with open(self.journal_file, "ab") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
             return True
         except Exception as e:
             print(f"Error saving game: {e}")
+            # Skip the rest of this generation's journal and start over from a full snapshot
+            self.failed_generation = generation
+            self.write_failed.set()
             return False
-    
+
+    def save_game(self):
+        """Save the current game state to a file"""
+        return self.write_save(self.serialize())
+
+    def read_save_state(self):
+        """Read the save from disk as a state dict, or None if there is no save"""
+        if os.path.exists(self.save_file):
+            with open(self.save_file, "rb") as f:
+                state, self.generation = decode_snapshot(f.read())
+
+            # Replay changes journaled since the snapshot
+            if os.path.exists(self.journal_file):
+                with open(self.journal_file, "rb") as f:
+                    apply_journal(state, f.read(), self.generation)
+            return migrate(state)
+
+        if os.path.exists(self.legacy_save_file):
+            # JSON saves from before the binary format
+            with open(self.legacy_save_file, "r") as f:
+                return migrate(json.load(f))
+
+        return None
+
     def load_game(self):
         """Load game state from a file"""
         try:
-            if not os.path.exists(self.save_file):
+            state = self.read_save_state()
+            if state is None:
                 return False
-                
-            with open(self.save_file, "r") as f:
-                save_data = json.load(f)
-            
+
             # Load basic game state
-            self.game.bufos = save_data.get("bufos", 0)
-            self.game.total_bufos_earned = save_data.get("total_bufos_earned", 0)
-            self.game.click_power = save_data.get("click_power", 1)
-            self.game.current_theme = save_data.get("current_theme", "forest")
-            
+            self.engine.bufos = state["bufos"]
+            self.engine.total_bufos_earned = state["total_bufos_earned"]
+            self.engine.click_power = state["click_power"]
+            self.engine.current_theme = state["current_theme"]
+
             # Load buildings
-            for i, building_data in enumerate(save_data.get("buildings", [])):
-                if i < len(self.game.buildings):
-                    self.game.buildings[i]["owned"] = building_data.get("owned", 0)
-            
+            for i, owned in enumerate(state["owned"]):
+                if i < len(self.engine.buildings):
+                    self.engine.buildings[i]["owned"] = owned
+
             # Load upgrades
-            for i, upgrade_data in enumerate(save_data.get("upgrades", [])):
-                if i < len(self.game.upgrades):
-                    self.game.upgrades[i]["purchased"] = upgrade_data.get("purchased", False)
-            
+            for i, purchased in enumerate(state["upgrades"]):
+                if i < len(self.engine.upgrades):
+                    self.engine.upgrades[i]["purchased"] = purchased
+
             # Load achievements
-            for i, achievement_data in enumerate(save_data.get("achievements", [])):
-                if i < len(self.game.achievements):
-                    self.game.achievements[i]["earned"] = achievement_data.get("earned", False)
-            
+            for i, earned in enumerate(state["achievements"]):
+                if i < len(self.engine.achievements):
+                    self.engine.achievements[i]["earned"] = earned
+
             # Load stats
-            self.game.stats = save_data.get("stats", self.game.stats)
-            
-            # Recalculate bufos per second
-            self.game.bufos_per_second = self.game.calculate_bufos_per_second()
+            self.engine.stats.update(state["stats"])
+
+            # Load boosts that were still running
+            self.engine.restore_boost_timers(state["boosts"])
+
+            # Recalculate bufos per second and the menus' upgrade and achievement counts
+            self.engine.recalculate_production()
+            self.engine.count_progress()
             
+            # Unlock anything the loaded stats already reach
+            self.engine.check_achievements()
+
+            # Grant production for the time since the save in one step (boosts expire part-way)
+            if state["saved_at"]:
+                self.engine.apply_offline_progress(time.time() - state["saved_at"])
+
+            # The next save writes a fresh snapshot (this also converts legacy saves)
+            self.last_saved_state = None
+
             return True
-            
+
         except Exception as e:
             print(f"Error loading game: {e}")
             return False
-    
+
     def delete_save(self):
-        """Delete the save file to start a new game"""
-        try:
-            if os.path.exists(self.save_file):
-                os.remove(self.save_file)
-                return True
-            return False  # File didn't exist
-        except Exception as e:
-            print(f"Error deleting save file: {e}")
-            return False
-    
+        """Delete the save files to start a new game"""
+        deleted = False
+        self.last_saved_state = None
+
+        for path in (self.save_file, self.journal_file, self.legacy_save_file):
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+                    deleted = True
+            except Exception as e:
+                print(f"Error deleting save file: {e}")
+
+        return deleted
+
     def start_new_game(self):
         """Reset the game state to start a new game"""
         # Delete the existing save file first
         self.delete_save()
-        
+
         # Reset game state
-        self.game.bufos = 0
-        self.game.total_bufos_earned = 0
-        self.game.bufos_per_second = 0
-        self.game.click_power = 1
-        
-        # Reset buildings
-        for building in self.game.buildings:
-            building["owned"] = 0
-        
-        # Reset upgrades
-        for upgrade in self.game.upgrades:
-            upgrade["purchased"] = False
-        
-        # Reset achievements
-        for achievement in self.game.achievements:
-            achievement["earned"] = False
-        
-        # Reset stats but keep the current start time
-        self.game.stats = {
-            "clicks": 0,
-            "play_time": 0,
-            "buildings_purchased": 0,
-            "upgrades_purchased": 0,
-            "game_started": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-        
-        # Recalculate bufos per second
-        self.game.bufos_per_second = self.game.calculate_bufos_per_second()
-        
-        return True
\ No newline at end of file
+        self.engine.reset()
+
+        return True
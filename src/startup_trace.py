@@ -0,0 +1,176 @@
+"""
+Startup tracing.
+
+Run the game with BUFO_TRACE_STARTUP=1 in the environment (or pass
+--trace-startup to main.py) to record where the time goes between the
+entry point starting and the first frame being drawn. The trace records
+named phases and the cost of every module imported meanwhile. Once the
+first frame is presented, a JSON report is written (startup_trace.json by
+default, or the path in BUFO_TRACE_STARTUP_REPORT) and a summary is
+printed.
+
+This module must not import pygame or anything from src, so that the entry
+point can import it first and have those imports traced too.
+"""
+
+import builtins
+import json
+import os
+import platform
+import sys
+import time
+from contextlib import contextmanager
+
+TRACE_ENV_VAR = "BUFO_TRACE_STARTUP"
+REPORT_ENV_VAR = "BUFO_TRACE_STARTUP_REPORT"
+TRACE_FLAG = "--trace-startup"
+DEFAULT_REPORT_FILE = "startup_trace.json"
+REPORT_VERSION = 1
+
+# How many of the slowest imports the summary lists
+SUMMARY_IMPORTS = 10
+
+class StartupTrace:
+    """
+    Records timestamped startup phases and import costs.
+
+    When disabled every method returns immediately, so the trace calls can
+    stay in the startup path permanently.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.finished = not enabled
+        self.start = time.perf_counter()
+
+        # Phases as dicts of name, start, duration (ms since the trace started) and nesting depth
+        self.phases = []
+        self.depth = 0
+
+        # Imports as dicts of module, start, cumulative and self time (ms) and nesting depth
+        self.imports = []
+        self.import_stack = []
+        self.original_import = None
+
+        if enabled:
+            self.install_import_hook()
+
+    def now(self):
+        """Milliseconds since the trace started"""
+        return (time.perf_counter() - self.start) * 1000
+
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block as a named startup phase"""
+        if self.finished:
+            yield
+            return
+
+        entry = {"name": name, "start": self.now(), "duration": None, "depth": self.depth}
+        self.phases.append(entry)
+        self.depth += 1
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            entry["duration"] = self.now() - entry["start"]
+
+    def mark(self, name):
+        """Record a point in time as a phase without duration"""
+        if not self.finished:
+            self.phases.append({"name": name, "start": self.now(), "duration": 0.0, "depth": self.depth})
+
+    # Import timing
+
+    def install_import_hook(self):
+        self.original_import = builtins.__import__
+        builtins.__import__ = self.traced_import
+
+    def remove_import_hook(self):
+        if self.original_import is not None and builtins.__import__ is self.traced_import:
+            builtins.__import__ = self.original_import
+        self.original_import = None
+
+    def traced_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        """builtins.__import__ replacement timing the first import of each module"""
+        if level or name in sys.modules:
+            return self.original_import(name, globals, locals, fromlist, level)
+
+        start = time.perf_counter()
+        self.import_stack.append(0.0)
+        try:
+            return self.original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self.import_stack.pop()
+
+            # Charge this import to the one that triggered it
+            if self.import_stack:
+                self.import_stack[-1] += elapsed
+
+            self.imports.append({
+                "module": name,
+                "start": (start - self.start) * 1000,
+                "cumulative": elapsed * 1000,
+                "self": (elapsed - children) * 1000,
+                "depth": len(self.import_stack)
+            })
+
+    # Reporting
+
+    def first_frame(self):
+        """Call after every presented frame; finishes the trace after the first one"""
+        if not self.finished:
+            self.mark("first frame")
+            self.finish()
+
+    def build_report(self):
+        """The trace as a JSON-serializable dict"""
+        return {
+            "version": REPORT_VERSION,
+            "time_to_first_frame": self.now(),
+            "python": platform.python_version(),
+            "platform": sys.platform,
+            "argv": sys.argv,
+            "phases": self.phases,
+            "imports": sorted(self.imports, key=lambda entry: entry["start"])
+        }
+
+    def summary(self, report):
+        """Human readable summary of a report"""
+        lines = [f"Startup trace: first frame after {report['time_to_first_frame']:.1f} ms", "Phases:"]
+        for entry in report["phases"]:
+            lines.append(f"  {entry['start']:8.1f} ms  {entry['duration']:8.1f} ms  {'  ' * entry['depth']}{entry['name']}")
+
+        top_level = sum(entry["cumulative"] for entry in report["imports"] if entry["depth"] == 0)
+        lines.append(f"Imports: {len(report['imports'])} modules, {top_level:.1f} ms total. Slowest (self time):")
+        slowest = sorted(report["imports"], key=lambda entry: entry["self"], reverse=True)[:SUMMARY_IMPORTS]
+        for entry in slowest:
+            lines.append(f"  {entry['self']:8.1f} ms  {entry['cumulative']:8.1f} ms cumulative  {entry['module']}")
+        return "\n".join(lines)
+
+    def finish(self, report_file=None):
+        """Stop tracing, write the JSON report and print the summary"""
+        if self.finished:
+            return None
+        self.remove_import_hook()
+        self.finished = True
+
+        report = self.build_report()
+        report_file = report_file or os.environ.get(REPORT_ENV_VAR, DEFAULT_REPORT_FILE)
+        try:
+            with open(report_file, "w") as f:
+                json.dump(report, f, indent=2)
+        except Exception as e:
+            print(f"Error writing startup trace: {e}")
+
+        print(self.summary(report))
+        print(f"Startup trace written to {report_file}")
+        return report
+
+def tracing_requested():
+    """Whether startup tracing was asked for on the command line or in the environment"""
+    return TRACE_FLAG in sys.argv or os.environ.get(TRACE_ENV_VAR, "") not in ("", "0")
+
+# The process-wide trace, started when this module is first imported
+startup_trace = StartupTrace(tracing_requested())
@@ -0,0 +1,52 @@
+from collections import OrderedDict
+
+# Default number of rendered strings kept before the least recently used is evicted
+TEXT_CACHE_SIZE = 512
+
+class TextCache:
+    """
+    LRU cache of rendered text surfaces keyed by (font, text, color).
+    
+    Anti-aliased font rendering is one of the most expensive things the UI
+    does each frame, and almost every string it draws is the same as last
+    frame. Cached surfaces are shared, so callers must not modify them
+    (e.g. with set_alpha).
+    """
+    
+    def __init__(self, max_size=TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def render(self, font, text, color):
+        """Return the rendered surface for text, rendering it only on a cache miss"""
+        key = (font, text, color)
+        surface = self.surfaces.get(key)
+        
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+        
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+    
+    def clear(self):
+        """Drop all cached surfaces (e.g. after the display mode changes)"""
+        self.surfaces.clear()
+    
+    def get_stats(self):
+        """Hit/miss counters for profiling"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.surfaces),
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
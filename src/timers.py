@@ -0,0 +1,52 @@
+import heapq
+import itertools
+
+class TimerQueue:
+    """
+    Callbacks scheduled at points in game time, kept in a heap.
+
+    Only the earliest timer is ever looked at, so the per-update cost does
+    not depend on how many boosts, despawns and messages are pending.
+    Cancelled timers stay in the heap marked dead and are dropped when they
+    reach the top.
+    """
+
+    def __init__(self):
+        # Entries are [time, sequence, callback, args]; the sequence keeps equal times in scheduling order
+        self.heap = []
+        self.sequence = itertools.count()
+
+    def schedule(self, time, callback, *args):
+        """Call callback(*args) once game time reaches time; returns a handle for cancel()"""
+        timer = [time, next(self.sequence), callback, args]
+        heapq.heappush(self.heap, timer)
+        return timer
+
+    def cancel(self, timer):
+        """Stop a scheduled timer from firing (a timer that already fired is ignored)"""
+        if timer is not None:
+            timer[2] = None
+
+    def next_time(self):
+        """Game time of the earliest live timer, or None if nothing is scheduled"""
+        heap = self.heap
+        while heap and heap[0][2] is None:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def run_due(self, time):
+        """Fire every timer due at or before time, in time order; returns how many fired"""
+        fired = 0
+        while True:
+            due = self.next_time()
+            if due is None or due > time:
+                return fired
+
+            timer = heapq.heappop(self.heap)
+            callback, args = timer[2], timer[3]
+            timer[2] = None
+            callback(*args)
+            fired += 1
+
+    def __len__(self):
+        return sum(1 for timer in self.heap if timer[2] is not None)
@@ -1,5 +1,18 @@
 import pygame
-from src.constants import WIDTH, HEIGHT, WHITE, BLACK, BLUE, GREEN, PURPLE, RED, GOLD, FONT_SIZE, LARGE_FONT_SIZE, THEMES
+from src.constants import WIDTH, HEIGHT, WHITE, BLACK, BLUE, GREEN, PURPLE, RED, GOLD, FONT_SIZE, LARGE_FONT_SIZE, BUY_AMOUNTS
+from src.text_cache import TextCache
+from src.fonts import get_font
+from src.renderer import DirtyRectRenderer
+from src.hit_index import HitIndex
+from src.list_view import ListView
+from src.frame_profiler import frame_profiler
+
+# Font size and line spacing of the frame profiler HUD
+HUD_FONT_SIZE = 16
+HUD_LINE_HEIGHT = 18
+
+# Bottom of the scrolling menu lists, just above the back button
+MENU_LIST_BOTTOM = HEIGHT - 60
 
 class UI:
     """
@@ -12,8 +25,9 @@ class UI:
     def __init__(self, game):
         """Initialize the UI with a reference to the game instance"""
         self.game = game
-        self.font = pygame.font.SysFont("Arial", FONT_SIZE)
-        self.large_font = pygame.font.SysFont("Arial", LARGE_FONT_SIZE)
+        self.font = get_font(FONT_SIZE)
+        self.large_font = get_font(LARGE_FONT_SIZE)
+        self.hud_font = get_font(HUD_FONT_SIZE)
         
         # Button definitions for easy reuse
         self.button_height = 40
@@ -22,36 +36,69 @@ class UI:
         
         # Cache commonly used UI elements
         self.back_button = pygame.Rect(WIDTH // 2 - 50, HEIGHT - 50, 100, 40)
+        
+        # Rendered text surfaces, so unchanged strings cost only a blit
+        self.text_cache = TextCache()
+        
+        # Retained-mode renderer for the main screen
+        self.renderer = DirtyRectRenderer(game.screen)
+        
+        # Composited menu layers as name -> (key, surface)
+        self.menu_layers = {}
+        
+        # Scrolling lists of the buildings, upgrades (two per row) and achievements menus
+        upgrade_width = (WIDTH - 60) // 2
+        self.building_list = ListView((WIDTH // 2 - 300, 80, 600, MENU_LIST_BOTTOM - 80), (600, 80))
+        self.upgrade_list = ListView((30, 80, upgrade_width * 2 - 10, MENU_LIST_BOTTOM - 80),
+                                     (upgrade_width - 10, 60), columns=2)
+        self.achievement_list = ListView((WIDTH // 2 - 300, 100, 600, MENU_LIST_BOTTOM - 100), (600, 50))
+        
+        # Row keys of the buildings list in Max mode as index -> (owned, key, low, high); a key
+        # stays valid while the bufos stay within [low, high)
+        self.max_row_keys = {}
+        
+        # Clickable regions of the main screen and of each menu layer, registered as they are laid out
+        self.main_hits = HitIndex()
+        self.menu_hits = {}
+        
+        # The cheat box never changes layout, so its regions are registered once
+        self.cheat_box_hits = HitIndex()
+        input_rect, submit_button, cancel_button = self.get_cheat_box_rects()
+        self.cheat_box_hits.add(submit_button, game.submit_cheat_code)
+        self.cheat_box_hits.add(cancel_button, game.cancel_cheat_code)
+    
+    def render_text(self, text, color, font=None):
+        """Render text with the standard font (or the given one) through the text cache"""
+        return self.text_cache.render(font or self.font, text, color)
     
-    def create_button(self, x, y, width, height, color, text, text_color=WHITE):
-        """Helper to create a button with text"""
+    def create_button(self, x, y, width, height, color, text, text_color=WHITE, surface=None):
+        """Helper to create a button with text (on the screen unless another surface is given)"""
+        if surface is None:
+            surface = self.game.screen
         button_rect = pygame.Rect(x, y, width, height)
-        pygame.draw.rect(self.game.screen, color, button_rect)
+        pygame.draw.rect(surface, color, button_rect)
         
-        button_text = self.font.render(text, True, text_color)
-        self.game.screen.blit(button_text, (
+        button_text = self.render_text(text, text_color)
+        surface.blit(button_text, (
             button_rect.centerx - button_text.get_width() // 2,
             button_rect.centery - button_text.get_height() // 2
         ))
         
         return button_rect
     
-    def draw_semi_transparent_background(self):
-        """Draw a semi-transparent black background for menus"""
-        bg_surface = pygame.Surface((WIDTH, HEIGHT))
-        bg_surface.set_alpha(200)
-        bg_surface.fill(BLACK)
-        self.game.screen.blit(bg_surface, (0, 0))
+    def draw_semi_transparent_background(self, surface):
+        """Fill a menu layer with the semi-transparent black menu background"""
+        surface.fill((*BLACK, 200))
     
-    def draw_title(self, title_text):
+    def draw_title(self, surface, title_text):
         """Draw a centered title for menus"""
-        title_surface = self.large_font.render(title_text, True, WHITE)
-        self.game.screen.blit(title_surface, (
+        title_surface = self.render_text(title_text, WHITE, self.large_font)
+        surface.blit(title_surface, (
             WIDTH // 2 - title_surface.get_width() // 2,
             20
         ))
     
-    def draw_back_button(self):
+    def draw_back_button(self, surface):
         """Draw a standard back button and return its rect"""
         return self.create_button(
             WIDTH // 2 - 50,
@@ -59,333 +106,498 @@ class UI:
             100,
             40,
             BLUE,
-            "Back"
+            "Back",
+            surface=surface
         )
     
-    def draw_main_ui(self):
-        """Draw the main game interface"""
-        # Draw current theme background
-        self.game.screen.blit(self.game.background_imgs[self.game.current_theme], (0, 0))
+    def get_buy_amount_rects(self):
+        """Rects of the x1/x10/x100/Max buttons in the top-right of the buildings menu"""
+        button_width = 60
+        start_x = WIDTH - (button_width + 10) * len(BUY_AMOUNTS)
+        return [pygame.Rect(start_x + i * (button_width + 10), 20, button_width, 36)
+                for i in range(len(BUY_AMOUNTS))]
+    
+    def draw_buy_amount_buttons(self, surface, hits):
+        """Draw the buy amount selector, highlighting the selected amount"""
+        for amount, button_rect in zip(BUY_AMOUNTS, self.get_buy_amount_rects()):
+            selected = amount == self.game.buy_amount
+            label = amount if isinstance(amount, str) else f"x{amount}"
+            self.create_button(button_rect.x, button_rect.y, button_rect.width, button_rect.height,
+                               GOLD if selected else BLUE, label, BLACK if selected else WHITE, surface)
+            hits.add(button_rect, self.game.select_buy_amount, amount)
+    
+    def main_background_key(self):
+        """What the static main screen layer depends on"""
+        boosted = any(boost["active"] for boost_name, boost in self.game.engine.boosts.items())
+        return (self.game.engine.current_theme, boosted)
+    
+    def build_main_background(self):
+        """Draw the parts of the main screen that rarely change onto their own surface"""
+        theme, boosted = self.main_background_key()
+        surface = self.game.assets.get_image(self.game.engine.content.themes[theme]["background"], (WIDTH, HEIGHT)).copy()
         
         # Draw bufo image (golden if boost is active)
-        if any(boost["active"] for boost_name, boost in self.game.boosts.items()):
-            self.game.screen.blit(self.game.golden_bufo_img, self.game.bufo_rect)
-        else:
-            self.game.screen.blit(self.game.bufo_img, self.game.bufo_rect)
+        surface.blit(self.game.assets.get_image("golden_bufo.png" if boosted else "bufo.png", (200, 200)),
+                     self.game.bufo_rect)
+        
+        # Draw main menu buttons
+        button_y = HEIGHT - 50
+        button_width = self.standard_button_width
+        button_spacing = 160
+        
+        # Create main menu buttons (removed Save/New Game)
+        buttons = [
+            # x, y, width, height, color, text, text_color, menu flag
+            (10, button_y, button_width, self.button_height, GOLD, "Buildings",BLACK, "show_buildings_menu"),
+            (10 + button_spacing, button_y, button_width, self.button_height, GOLD, "Upgrades",BLACK, "show_upgrade_menu"),
+            (10 + button_spacing * 2, button_y, button_width, self.button_height, GOLD, "Achievements",BLACK, "show_achievements"),
+            (10 + button_spacing * 3, button_y, button_width, self.button_height, GOLD, "Stats",BLACK, "show_stats"),
+            (10 + button_spacing * 4, button_y, button_width, self.button_height, GOLD, "Themes", BLACK, "show_theme_selector"),
+        ]
+        
+        # Draw all buttons, registering where they can be clicked
+        hits = self.main_hits
+        hits.clear()
+        for *button_data, menu in buttons:
+            hits.add(self.create_button(*button_data, surface=surface), self.game.open_menu, menu)
+        
+        # Cheat code button
+        hits.add(self.create_button(WIDTH - 50, 10, 40, 40, PURPLE, "C", surface=surface), self.game.open_cheat_box)
+        
+        # The bufo itself
+        hits.add(self.game.bufo_rect, self.game.click_main_bufo)
+        
+        return surface
+    
+    def add_main_widgets(self):
+        """Declare the changing parts of the main screen to the renderer"""
+        renderer = self.renderer
+        renderer.set_background(self.main_background_key(), self.build_main_background)
         
         # Draw golden bufo if active (special smaller golden bufo that appears randomly)
-        if hasattr(self.game, 'golden_bufo_active') and self.game.golden_bufo_active and self.game.golden_bufo_rect:
-            # Scale the golden bufo image to the correct size
-            scaled_golden_img = pygame.transform.scale(self.game.golden_bufo_img, 
-                                               (self.game.golden_bufo_rect.width, 
-                                                self.game.golden_bufo_rect.height))
-            
-            # Draw the golden bufo at its position
-            self.game.screen.blit(scaled_golden_img, self.game.golden_bufo_rect)
+        if self.game.golden_bufo_active and self.game.golden_bufo_rect:
+            golden_rect = self.game.golden_bufo_rect
             
             # Add a pulsing effect to make it more noticeable
             pulse_time = pygame.time.get_ticks() % 1000 / 1000  # 0 to 1 over 1 second
             pulse_size = int(10 * pulse_time)  # 0 to 10 pixels
-            glow_rect = self.game.golden_bufo_rect.inflate(pulse_size, pulse_size)
-            pygame.draw.rect(self.game.screen, GOLD, glow_rect, 2)
             
             # Add a countdown timer over it
-            time_left = max(0, int((self.game.golden_bufo_end_time - pygame.time.get_ticks()) / 1000))
-            time_text = self.font.render(f"{time_left}s", True, GOLD)
-            self.game.screen.blit(time_text, 
-                                 (self.game.golden_bufo_rect.centerx - time_text.get_width() // 2, 
-                                  self.game.golden_bufo_rect.top - 20))
+            time_left = max(0, int(self.game.golden_bufo_end_time - self.game.engine.time))
+            time_text = self.render_text(f"{time_left}s", GOLD)
+            time_pos = (golden_rect.centerx - time_text.get_width() // 2, golden_rect.top - 20)
+            
+            # The golden bufo image pre-scaled to the correct size
+            golden_img = self.game.assets.get_image("golden_bufo.png", golden_rect.size)
+            
+            def draw_golden_bufo(screen):
+                screen.blit(golden_img, golden_rect)
+                pygame.draw.rect(screen, GOLD, golden_rect.inflate(pulse_size, pulse_size), 2)
+                screen.blit(time_text, time_pos)
+            
+            area = golden_rect.inflate(12, 12).union(time_text.get_rect(topleft=time_pos))
+            renderer.add("golden_bufo", (golden_rect.topleft, pulse_size, time_text), area, draw_golden_bufo)
         
         # Draw bufo counter
-        bufo_text = self.large_font.render(f"{self.game.format_number(self.game.bufos)} Bufos", True, WHITE)
-        self.game.screen.blit(bufo_text, (WIDTH // 2 - bufo_text.get_width() // 2, 50))
+        bufo_text = self.render_text(f"{self.game.format_number(self.game.engine.bufos)} Bufos", WHITE, self.large_font)
+        renderer.blit("bufos", bufo_text, (WIDTH // 2 - bufo_text.get_width() // 2, 50))
         
         # Draw bufos per second
-        bps_text = self.font.render(f"{self.game.format_number(self.game.bufos_per_second)} bufos per second", True, WHITE)
-        self.game.screen.blit(bps_text, (WIDTH // 2 - bps_text.get_width() // 2, 100))
+        bps_text = self.render_text(f"{self.game.format_number(self.game.engine.bufos_per_second)} bufos per second", WHITE)
+        renderer.blit("bps", bps_text, (WIDTH // 2 - bps_text.get_width() // 2, 100))
         
         # Draw active boosts
         boost_y = 150
-        for boost_name, boost in self.game.boosts.items():
+        for boost_name, boost in self.game.engine.boosts.items():
             if boost["active"]:
-                time_left = (boost["end_time"] - pygame.time.get_ticks()) / 1000
-                boost_text = self.font.render(f"{boost_name.replace('_', ' ').title()}: {time_left:.1f}s", True, GOLD)
-                self.game.screen.blit(boost_text, (WIDTH // 2 - boost_text.get_width() // 2, boost_y))
+                time_left = self.game.engine.boost_time_left(boost)
+                boost_text = self.render_text(f"{boost_name.replace('_', ' ').title()}: {time_left:.1f}s", GOLD)
+                renderer.blit(("boost", boost_name), boost_text, (WIDTH // 2 - boost_text.get_width() // 2, boost_y))
                 boost_y += 30
         
-        # Draw main menu buttons
-        button_y = HEIGHT - 50
-        button_width = self.standard_button_width
-        button_spacing = 160
-        
-        # Create main menu buttons (removed Save/New Game)
-        buttons = [
-            # x, y, width, height, color, text, text_color
-            (10, button_y, button_width, self.button_height, GOLD, "Buildings",BLACK),
-            (10 + button_spacing, button_y, button_width, self.button_height, GOLD, "Upgrades",BLACK),
-            (10 + button_spacing * 2, button_y, button_width, self.button_height, GOLD, "Achievements",BLACK),
-            (10 + button_spacing * 3, button_y, button_width, self.button_height, GOLD, "Stats",BLACK),
-            (10 + button_spacing * 4, button_y, button_width, self.button_height, GOLD, "Themes", BLACK),
-        ]
-        
-        # Draw all buttons
-        for button_data in buttons:
-            self.create_button(*button_data)
-        
-        # Cheat code button
-        cheat_button = pygame.Rect(WIDTH - 50, 10, 40, 40)
-        pygame.draw.rect(self.game.screen, PURPLE, cheat_button)
-        cheat_text = self.font.render("C", True, WHITE)
-        self.game.screen.blit(cheat_text, (
-            cheat_button.centerx - cheat_text.get_width() // 2,
-            cheat_button.centery - cheat_text.get_height() // 2
-        ))
-        
         # Draw cheat message if active
-        if self.game.cheat_message and pygame.time.get_ticks() - self.game.cheat_message_time < 3000:
-            cheat_msg_text = self.font.render(self.game.cheat_message, True, GOLD)
-            self.game.screen.blit(cheat_msg_text, (WIDTH // 2 - cheat_msg_text.get_width() // 2, 20))
+        if self.game.cheat_message:
+            cheat_msg_text = self.render_text(self.game.cheat_message, GOLD)
+            renderer.blit("cheat_message", cheat_msg_text, (WIDTH // 2 - cheat_msg_text.get_width() // 2, 20))
         
-        # Draw bufos per second
-        bps_text = self.font.render(f"{self.game.format_number(self.game.bufos_per_second)} bufos per second", True, WHITE)
-        self.game.screen.blit(bps_text, (WIDTH // 2 - bps_text.get_width() // 2, 100))
+        # Floating texts and particles move every frame
+        renderer.add_transient(self.game.effects.get_rects(), self.game.effects.draw)
         
-        # Draw active boosts
-        boost_y = 150
-        for boost_name, boost in self.game.boosts.items():
-            if boost["active"]:
-                time_left = (boost["end_time"] - pygame.time.get_ticks()) / 1000
-                boost_text = self.font.render(f"{boost_name.replace('_', ' ').title()}: {time_left:.1f}s", True, GOLD)
-                self.game.screen.blit(boost_text, (WIDTH // 2 - boost_text.get_width() // 2, boost_y))
-                boost_y += 30
+        # Frame profiler HUD; its text only changes every HUD_REFRESH seconds
+        if frame_profiler.enabled:
+            for i, line in enumerate(frame_profiler.get_hud_lines()):
+                renderer.blit(("profiler", i), self.render_text(line, GREEN, self.hud_font), (10, 10 + i * HUD_LINE_HEIGHT))
         
-
-    def draw_buildings_menu(self):
+        # The open menu (if any) goes over everything else
+        renderer.set_overlay(*self.get_menu_layer())
+    
+    def draw_main_screen(self):
+        """Draw and present the main screen and open menu, redrawing only the regions that changed"""
+        with frame_profiler.phase("draw_main_ui"):
+            self.add_main_widgets()
+        return self.renderer.present()
+    
+    def draw_main_ui(self):
+        """Draw the whole main game interface without presenting it (used under the cheat box)"""
+        with frame_profiler.phase("draw_main_ui"):
+            self.add_main_widgets()
+            self.renderer.render_full()
+    
+    def get_menu_layer(self):
+        """
+        The open menu as a cached (key, layer) pair, or (None, None).
+        
+        Each menu is composited once onto its own full-screen layer with the
+        semi-transparent background baked in. The layer is only redrawn when
+        the data the menu shows changes (owned counts, affordability, earned
+        achievements, ...), so an open menu costs a single blit per frame.
+        For the scrolling lists only the rows in view (and the scroll offset)
+        are part of that data.
+        """
+        engine = self.game.engine
+        
+        if self.game.show_buildings_menu:
+            view = self.building_list
+            view.set_count(len(engine.buildings))
+            rows = tuple(self.building_row_key(index) for index in view.visible_items())
+            return self.get_layer("buildings", (self.game.buy_amount, view.offset(), rows), self.draw_buildings_menu)
+        
+        if self.game.show_upgrade_menu:
+            available_upgrades = engine.available_upgrades
+            view = self.upgrade_list
+            view.set_count(len(available_upgrades))
+            rows = tuple(self.upgrade_row_key(available_upgrades[position]) for position in view.visible_items())
+            return self.get_layer("upgrades", (len(available_upgrades), view.offset(), rows), self.draw_upgrades_menu)
+        
+        if self.game.show_achievements:
+            view = self.achievement_list
+            view.set_count(len(engine.achievements))
+            earned = tuple(engine.achievements[index]["earned"] for index in view.visible_items())
+            return self.get_layer("achievements", (engine.achievements_earned, view.offset(), earned),
+                                  self.draw_achievements_menu)
+        
+        if self.game.show_stats:
+            lines = tuple(self.get_stats_lines())
+            return self.get_layer("stats", lines, lambda surface, hits: self.draw_stats_menu(surface, hits, lines))
+        
+        if self.game.show_theme_selector:
+            return self.get_layer("themes", engine.current_theme, self.draw_theme_selector)
+        
+        return None, None
+    
+    def get_layer(self, name, data_key, draw):
+        """
+        Return the cached layer for a menu, redrawing it with draw(surface, hits) if data_key changed.
+        
+        draw registers the menu's clickable regions into hits as it lays them out.
+        """
+        key = (name, data_key)
+        layer = self.menu_layers.get(name)
+        
+        if layer is None or layer[0] != key:
+            # Reuse the layer's surface rather than allocating a full-screen one per rebuild
+            surface = layer[1] if layer else pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+            hits = self.menu_hits.setdefault(name, HitIndex())
+            hits.clear()
+            with frame_profiler.phase(f"menu:{name}"):
+                self.draw_semi_transparent_background(surface)
+                draw(surface, hits)
+            layer = self.menu_layers[name] = (key, surface)
+        
+        return layer
+    
+    def get_open_list(self):
+        """The scrolling list of the open menu, or None"""
+        if self.game.show_cheat_box:
+            return None
+        if self.game.show_buildings_menu:
+            return self.building_list
+        if self.game.show_upgrade_menu:
+            return self.upgrade_list
+        if self.game.show_achievements:
+            return self.achievement_list
+        return None
+    
+    def scroll_menu(self, pixels, smooth=True):
+        """Scroll the open menu's list, if it has one"""
+        view = self.get_open_list()
+        if view is not None:
+            view.scroll_by(pixels, smooth)
+    
+    def update_scrolling(self):
+        """Ease the open menu's list towards its scroll target. Call once per tick"""
+        view = self.get_open_list()
+        if view is not None:
+            view.update()
+    
+    def get_hit_index(self):
+        """Clickable regions of whatever is on top: the cheat box, the open menu or the main screen"""
+        if self.game.show_cheat_box:
+            return self.cheat_box_hits
+        
+        # Lay out the open menu (or main screen) now if a click arrives before it was drawn
+        key, layer = self.get_menu_layer()
+        if key is not None:
+            return self.menu_hits[key[0]]
+        
+        self.renderer.set_background(self.main_background_key(), self.build_main_background)
+        return self.main_hits
+    
+    def draw_buildings_menu(self, surface, hits):
         """Draw the buildings menu"""
-        # Draw semi-transparent background
-        self.draw_semi_transparent_background()
-        
         # Draw title
-        self.draw_title("Buildings")
+        self.draw_title(surface, "Buildings")
         
-        # Draw buildings list
-        y_pos = 80
-        building_height = 80  # Increased height to accommodate images
+        # Draw buy amount selector
+        self.draw_buy_amount_buttons(surface, hits)
         
-        for i, building in enumerate(self.game.buildings):
-            # Building container
-            building_rect = pygame.Rect(WIDTH // 2 - 300, y_pos, 600, building_height)
-            
-            # Determine if building is affordable
-            affordable = self.game.bufos >= self.game.calculate_building_cost(building)
-            color = GREEN if affordable else RED
-            
-            pygame.draw.rect(self.game.screen, color, building_rect, 2)
-            
-            # Draw building image
-            image_rect = pygame.Rect(building_rect.x + 10, building_rect.y + 15, 50, 50)
-            self.game.screen.blit(self.game.building_imgs[building['name']], image_rect)
-            
-            # Building name and owned
-            name_text = self.font.render(f"{building['name']} ({building['owned']})", True, WHITE)
-            self.game.screen.blit(name_text, (building_rect.x + 70, building_rect.y + 10))
-            
-            # Building description
-            desc_text = self.font.render(building['description'], True, GOLD)
-            self.game.screen.blit(desc_text, (building_rect.x + 70, building_rect.y + 40))
-            
-            # Building cost and production
-            cost = self.game.calculate_building_cost(building)
-            cost_text = self.font.render(f"Cost: {self.game.format_number(cost)} bufos", True, WHITE)
-            prod_text = self.font.render(f"Produces: {self.game.format_number(building['base_production'])} bps", True, WHITE)
-            
-            self.game.screen.blit(cost_text, (building_rect.right - cost_text.get_width() - 10, building_rect.y + 10))
-            self.game.screen.blit(prod_text, (building_rect.right - prod_text.get_width() - 10, building_rect.y + 40))
-            
-            y_pos += building_height + 10
+        # Draw the visible part of the buildings list
+        self.building_list.draw(surface, hits, self.building_row_key, self.draw_building_row, self.game.buy_building)
         
         # Back button
-        self.draw_back_button()
+        hits.add(self.draw_back_button(surface), self.game.close_menus)
+    
+    def building_row_key(self, index):
+        """What a row of the buildings list shows: owned count, amount to buy and whether it is affordable"""
+        building = self.game.engine.buildings[index]
+        if self.game.buy_amount == "Max":
+            return self.max_building_row_key(index, building)
+        count = self.game.get_buy_count(building)
+        return (building["owned"], count, self.game.engine.bufos >= self.game.calculate_building_cost(building, count))
+    
+    def max_building_row_key(self, index, building):
+        """
+        building_row_key in Max mode, where the amount to buy follows the bufos.
+        
+        The key only changes when the bufos cross the cost of the current
+        amount or of one more, so it is only worked out again then.
+        """
+        bufos = self.game.engine.bufos
+        cached = self.max_row_keys.get(index)
+        if cached is not None and cached[0] == building["owned"] and cached[2] <= bufos < cached[3]:
+            return cached[1]
+        
+        count = self.game.get_buy_count(building)
+        cost = self.game.calculate_building_cost(building, count)
+        if bufos >= cost:
+            key, low, high = (building["owned"], count, True), cost, self.game.calculate_building_cost(building, count + 1)
+        else:
+            # Not even the next one is affordable
+            key, low, high = (building["owned"], count, False), 0, cost
+        self.max_row_keys[index] = (building["owned"], key, low, high)
+        return key
+    
+    def draw_building_row(self, surface, index):
+        """Draw one building onto its row surface"""
+        building = self.game.engine.buildings[index]
+        building_rect = surface.get_rect()
+        
+        # Determine if the selected amount is affordable
+        count = self.game.get_buy_count(building)
+        cost = self.game.calculate_building_cost(building, count)
+        affordable = self.game.engine.bufos >= cost
+        color = GREEN if affordable else RED
+        
+        pygame.draw.rect(surface, color, building_rect, 2)
+        
+        # Draw building image
+        image_rect = pygame.Rect(building_rect.x + 10, building_rect.y + 15, 50, 50)
+        surface.blit(self.game.assets.get_image(self.game.building_image_name(building), image_rect.size), image_rect)
+        
+        # Building name and owned
+        name_text = self.render_text(f"{building['name']} ({building['owned']})", WHITE)
+        surface.blit(name_text, (building_rect.x + 70, building_rect.y + 10))
+        
+        # Building description
+        desc_text = self.render_text(building['description'], GOLD)
+        surface.blit(desc_text, (building_rect.x + 70, building_rect.y + 40))
+        
+        # Building cost and production
+        cost_label = f"Buy {count}" if count > 1 else "Cost"
+        cost_text = self.render_text(f"{cost_label}: {self.game.format_number(cost)} bufos", WHITE)
+        prod_text = self.render_text(f"Produces: {self.game.format_number(building['base_production'])} bps", WHITE)
+        
+        surface.blit(cost_text, (building_rect.right - cost_text.get_width() - 10, building_rect.y + 10))
+        surface.blit(prod_text, (building_rect.right - prod_text.get_width() - 10, building_rect.y + 40))
     
-    def draw_upgrades_menu(self):
+    def draw_upgrades_menu(self, surface, hits):
         """Draw the upgrades menu"""
-        # Draw semi-transparent background
-        self.draw_semi_transparent_background()
-        
         # Draw title
-        self.draw_title("Upgrades")
-        
-        # Draw upgrades list
-        upgrade_height = 60
-        upgrades_per_row = 2
-        upgrade_width = (WIDTH - 60) // upgrades_per_row
+        self.draw_title(surface, "Upgrades")
         
-        # Count available (unpurchased) upgrades
-        available_upgrades = [u for u in self.game.upgrades if not u["purchased"]]
+        # Indexes of the available (unpurchased) upgrades, kept by the engine
+        available_upgrades = self.game.engine.available_upgrades
         
         if not available_upgrades:
             # No upgrades available
-            no_upgrades_text = self.font.render("All upgrades purchased!", True, GOLD)
-            self.game.screen.blit(no_upgrades_text, (
+            no_upgrades_text = self.render_text("All upgrades purchased!", GOLD)
+            surface.blit(no_upgrades_text, (
                 WIDTH // 2 - no_upgrades_text.get_width() // 2,
                 HEIGHT // 2 - no_upgrades_text.get_height() // 2
             ))
         else:
-            # Draw available upgrades
-            for i, upgrade in enumerate(available_upgrades):
-                # Calculate position
-                col = i % upgrades_per_row
-                row = i // upgrades_per_row
-                
-                x_pos = 30 + (col * upgrade_width)
-                y_pos = 80 + (row * (upgrade_height + 10))
-                
-                # Upgrade container
-                upgrade_rect = pygame.Rect(x_pos, y_pos, upgrade_width - 10, upgrade_height)
-                
-                # Determine if upgrade is affordable
-                affordable = self.game.bufos >= upgrade["cost"]
-                color = GREEN if affordable else RED
-                
-                pygame.draw.rect(self.game.screen, color, upgrade_rect, 2)
-                
-                # Upgrade name
-                name_text = self.font.render(upgrade["name"], True, WHITE)
-                self.game.screen.blit(name_text, (upgrade_rect.x + 10, upgrade_rect.y + 5))
-                
-                # Upgrade description
-                desc_text = self.font.render(upgrade["description"], True, GOLD)
-                desc_rect = desc_text.get_rect(x=upgrade_rect.x + 10, y=upgrade_rect.y + 30)
-                
-                # Truncate description if too long
-                if desc_rect.width > upgrade_rect.width - 20:
-                    desc_text = self.font.render(upgrade["description"][:30] + "...", True, GOLD)
-                
-                self.game.screen.blit(desc_text, (upgrade_rect.x + 10, upgrade_rect.y + 30))
-                
-                # Upgrade cost
-                cost_text = self.font.render(f"Cost: {self.game.format_number(upgrade['cost'])}", True, WHITE)
-                self.game.screen.blit(cost_text, (upgrade_rect.right - cost_text.get_width() - 10, upgrade_rect.y + 5))
+            # Draw the visible available upgrades, two per row
+            self.upgrade_list.draw(surface, hits,
+                                   lambda position: self.upgrade_row_key(available_upgrades[position]),
+                                   lambda row_surface, position: self.draw_upgrade_row(row_surface, available_upgrades[position]),
+                                   lambda position: self.game.buy_upgrade(available_upgrades[position]))
         
         # Back button
-        self.draw_back_button()
+        hits.add(self.draw_back_button(surface), self.game.close_menus)
     
-    def draw_achievements_menu(self):
-        """Draw the achievements menu"""
-        # Draw semi-transparent background
-        self.draw_semi_transparent_background()
+    def upgrade_row_key(self, index):
+        """What an entry of the upgrades list shows: which upgrade and whether it is affordable"""
+        return (index, self.game.engine.bufos >= self.game.engine.upgrades[index]["cost"])
+    
+    def draw_upgrade_row(self, surface, index):
+        """Draw one upgrade onto its entry surface"""
+        upgrade = self.game.engine.upgrades[index]
+        upgrade_rect = surface.get_rect()
         
-        # Draw title
-        self.draw_title("Achievements")
+        # Determine if upgrade is affordable
+        affordable = self.game.engine.bufos >= upgrade["cost"]
+        color = GREEN if affordable else RED
         
-        # Count unlocked achievements
-        unlocked = sum(1 for a in self.game.achievements if a["earned"])
-        total = len(self.game.achievements)
-        progress_text = self.font.render(f"Progress: {unlocked}/{total}", True, GOLD)
-        self.game.screen.blit(progress_text, (WIDTH // 2 - progress_text.get_width() // 2, 60))
+        pygame.draw.rect(surface, color, upgrade_rect, 2)
         
-        # Draw achievements list
-        y_pos = 100
-        achievement_height = 50
+        # Upgrade name
+        name_text = self.render_text(upgrade["name"], WHITE)
+        surface.blit(name_text, (upgrade_rect.x + 10, upgrade_rect.y + 5))
         
-        for achievement in self.game.achievements:
-            # Achievement container
-            achievement_rect = pygame.Rect(WIDTH // 2 - 300, y_pos, 600, achievement_height)
-            
-            color = GOLD if achievement["earned"] else (100, 100, 100)
-            pygame.draw.rect(self.game.screen, color, achievement_rect, 2)
-            
-            # Achievement name
-            name_text = self.font.render(achievement["name"], True, WHITE if achievement["earned"] else (150, 150, 150))
-            self.game.screen.blit(name_text, (achievement_rect.x + 10, achievement_rect.y + 5))
-            
-            # Achievement description
-            desc_text = self.font.render(achievement["description"], True, color)
-            self.game.screen.blit(desc_text, (achievement_rect.x + 10, achievement_rect.y + 25))
-            
-            y_pos += achievement_height + 10
+        # Upgrade description
+        desc_text = self.render_text(upgrade["description"], GOLD)
+        desc_rect = desc_text.get_rect(x=upgrade_rect.x + 10, y=upgrade_rect.y + 30)
+        
+        # Truncate description if too long
+        if desc_rect.width > upgrade_rect.width - 20:
+            desc_text = self.render_text(upgrade["description"][:30] + "...", GOLD)
+        
+        surface.blit(desc_text, (upgrade_rect.x + 10, upgrade_rect.y + 30))
+        
+        # Upgrade cost
+        cost_text = self.render_text(f"Cost: {self.game.format_number(upgrade['cost'])}", WHITE)
+        surface.blit(cost_text, (upgrade_rect.right - cost_text.get_width() - 10, upgrade_rect.y + 5))
+    
+    def draw_achievements_menu(self, surface, hits):
+        """Draw the achievements menu"""
+        # Draw title
+        self.draw_title(surface, "Achievements")
+        
+        # Unlocked achievements, counted by the engine as they are earned
+        unlocked = self.game.engine.achievements_earned
+        total = len(self.game.engine.achievements)
+        progress_text = self.render_text(f"Progress: {unlocked}/{total}", GOLD)
+        surface.blit(progress_text, (WIDTH // 2 - progress_text.get_width() // 2, 60))
+        
+        # Draw the visible part of the achievements list
+        self.achievement_list.draw(surface, hits, lambda index: self.game.engine.achievements[index]["earned"],
+                                   self.draw_achievement_row)
         
         # Back button
-        self.draw_back_button()
+        hits.add(self.draw_back_button(surface), self.game.close_menus)
     
-    def draw_stats_menu(self):
-        """Draw the stats menu"""
-        # Draw semi-transparent background
-        self.draw_semi_transparent_background()
+    def draw_achievement_row(self, surface, index):
+        """Draw one achievement onto its row surface"""
+        achievement = self.game.engine.achievements[index]
+        achievement_rect = surface.get_rect()
         
-        # Draw title
-        self.draw_title("Statistics")
+        color = GOLD if achievement["earned"] else (100, 100, 100)
+        pygame.draw.rect(surface, color, achievement_rect, 2)
         
-        # Draw stats
-        y_pos = 80
-        line_height = 30
+        # Achievement name
+        name_text = self.render_text(achievement["name"], WHITE if achievement["earned"] else (150, 150, 150))
+        surface.blit(name_text, (achievement_rect.x + 10, achievement_rect.y + 5))
         
-        # Define all stats to display
+        # Achievement description
+        desc_text = self.render_text(achievement["description"], color)
+        surface.blit(desc_text, (achievement_rect.x + 10, achievement_rect.y + 25))
+    
+    def get_stats_lines(self):
+        """The (label, value) lines shown in the stats menu"""
+        play_time = int(self.game.engine.stats['play_time'])
         stats_to_display = [
-            ("Total bufos earned", self.game.format_number(self.game.total_bufos_earned)),
-            ("Total clicks", str(self.game.stats['clicks'])),
-            ("Buildings purchased", str(self.game.stats['buildings_purchased'])),
-            ("Upgrades purchased", str(self.game.stats['upgrades_purchased'])),
-            (f"Play time", f"{self.game.stats['play_time'] // 60} minutes, {self.game.stats['play_time'] % 60} seconds"),
-            ("Game started", self.game.stats['game_started']),
-            ("Current production", f"{self.game.format_number(self.game.bufos_per_second)} bufos per second"),
-            ("Click power", str(self.game.click_power))
+            ("Total bufos earned", self.game.format_number(self.game.engine.total_bufos_earned)),
+            ("Total clicks", str(self.game.engine.stats['clicks'])),
+            ("Buildings purchased", str(self.game.engine.stats['buildings_purchased'])),
+            ("Upgrades purchased", str(self.game.engine.stats['upgrades_purchased'])),
+            ("Play time", f"{play_time // 60} minutes, {play_time % 60} seconds"),
+            ("Game started", self.game.engine.stats['game_started']),
+            ("Current production", f"{self.game.format_number(self.game.engine.bufos_per_second)} bufos per second"),
+            ("Click power", str(self.game.engine.click_power))
         ]
         
         # Add golden bufos stat if available
-        if "golden_bufos_clicked" in self.game.stats:
-            stats_to_display.append(("Golden bufos caught", str(self.game.stats['golden_bufos_clicked'])))
+        if "golden_bufos_clicked" in self.game.engine.stats:
+            stats_to_display.append(("Golden bufos caught", str(self.game.engine.stats['golden_bufos_clicked'])))
+        
+        return stats_to_display
+    
+    def draw_stats_menu(self, surface, hits, stats_to_display):
+        """Draw the stats menu"""
+        # Draw title
+        self.draw_title(surface, "Statistics")
+        
+        # Draw stats
+        y_pos = 80
+        line_height = 30
         
         # Draw each stat line
         for label, value in stats_to_display:
-            stat_text = self.font.render(f"{label}: {value}", True, WHITE)
-            self.game.screen.blit(stat_text, (WIDTH // 2 - 200, y_pos))
+            stat_text = self.render_text(f"{label}: {value}", WHITE)
+            surface.blit(stat_text, (WIDTH // 2 - 200, y_pos))
             y_pos += line_height
         
         # Back button
-        self.draw_back_button()
+        hits.add(self.draw_back_button(surface), self.game.close_menus)
     
-    def draw_theme_selector(self):
+    def draw_theme_selector(self, surface, hits):
         """Draw the theme selection menu"""
-        # Draw semi-transparent background
-        self.draw_semi_transparent_background()
-        
         # Draw title
-        self.draw_title("Select Theme")
+        self.draw_title(surface, "Select Theme")
         
         # Draw theme options
         y_pos = 80
         theme_height = 100
         
-        for theme_name in THEMES:
+        themes = self.game.engine.content.themes
+        for theme_name in themes:
             # Theme container
             theme_rect = pygame.Rect(WIDTH // 2 - 200, y_pos, 400, theme_height)
             
-            color = GOLD if theme_name == self.game.current_theme else WHITE
-            pygame.draw.rect(self.game.screen, color, theme_rect, 2)
+            color = GOLD if theme_name == self.game.engine.current_theme else WHITE
+            pygame.draw.rect(surface, color, theme_rect, 2)
+            hits.add(theme_rect, self.game.select_theme, theme_name)
             
             # Theme preview (small thumbnail of background)
             preview_rect = pygame.Rect(theme_rect.x + 10, theme_rect.y + 10, 80, 80)
-            preview_img = pygame.transform.scale(self.game.background_imgs[theme_name], (80, 80))
-            self.game.screen.blit(preview_img, preview_rect)
+            preview_img = self.game.assets.get_image(themes[theme_name]["background"], preview_rect.size)
+            surface.blit(preview_img, preview_rect)
             
             # Theme name
-            name_text = self.font.render(theme_name.title(), True, color)
-            self.game.screen.blit(name_text, (theme_rect.x + 100, theme_rect.y + theme_height // 2 - name_text.get_height() // 2))
+            name_text = self.render_text(theme_name.title(), color)
+            surface.blit(name_text, (theme_rect.x + 100, theme_rect.y + theme_height // 2 - name_text.get_height() // 2))
             
             y_pos += theme_height + 10
         
         # Back button
-        self.draw_back_button()
+        hits.add(self.draw_back_button(surface), self.game.close_menus)
+    
+    def get_cheat_box_rects(self):
+        """Rects of the cheat code input box and its submit and cancel buttons"""
+        input_rect = pygame.Rect(WIDTH // 2 - 200, HEIGHT // 2 - 50, 400, 40)
+        submit_button = pygame.Rect(WIDTH // 2 - 50, input_rect.bottom + 20, 100, 40)
+        cancel_button = pygame.Rect(WIDTH // 2 - 50, submit_button.bottom + 20, 100, 40)
+        return input_rect, submit_button, cancel_button
     
     def draw_cheat_box(self):
         """Draw the cheat code input box"""
+        input_rect, submit_button, cancel_button = self.get_cheat_box_rects()
+        
         # Draw input box
-        input_rect = pygame.Rect(WIDTH // 2 - 200, HEIGHT // 2 - 50, 400, 40)
         pygame.draw.rect(self.game.screen, WHITE, input_rect)
         
         # Draw input text
-        cheat_text = self.font.render(self.game.cheat_input, True, BLACK)
+        cheat_text = self.render_text(self.game.cheat_input, BLACK)
         self.game.screen.blit(cheat_text, (input_rect.x + 10, input_rect.y + 10))
         
         # Draw blinking cursor
@@ -394,42 +606,11 @@ class UI:
             pygame.draw.line(self.game.screen, BLACK, (cursor_x, input_rect.y + 5), (cursor_x, input_rect.y + 35), 2)
         
         # Draw label
-        label_text = self.font.render("Enter Cheat Code:", True, GOLD)
+        label_text = self.render_text("Enter Cheat Code:", GOLD)
         self.game.screen.blit(label_text, (WIDTH // 2 - label_text.get_width() // 2, input_rect.y - 30))
         
-        # Draw submit button
-        submit_button = self.create_button(
-            WIDTH // 2 - 50,
-            input_rect.bottom + 20,
-            100,
-            40,
-            GREEN,
-            "Submit"
-        )
-        
-        # Draw cancel button
-        cancel_button = self.create_button(
-            WIDTH // 2 - 50,
-            submit_button.bottom + 20,
-            100,
-            40,
-            RED,
-            "Cancel"
-        )
+        # Draw submit and cancel buttons
+        self.create_button(*submit_button, GREEN, "Submit")
+        self.create_button(*cancel_button, RED, "Cancel")
         
         return submit_button, cancel_button
-    
-    def draw_floating_texts(self):
-        """Draw all floating text effects"""
-        current_time = pygame.time.get_ticks()
-        for text in self.game.floating_text_manager.floating_texts:
-            elapsed = (current_time - text["creation_time"]) / 1000.0
-            alpha = 255 * (1 - (elapsed / text["lifetime"]))
-            
-            font = pygame.font.SysFont("Arial", text["size"])
-            text_surface = font.render(text["text"], True, text["color"])
-            
-            # Apply fading
-            text_surface.set_alpha(int(alpha))
-            
-            self.game.screen.blit(text_surface, text["position"])
\ No newline at end of file
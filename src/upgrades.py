@@ -1,72 +0,0 @@
-# Define game upgrades with their properties
-
-UPGRADES = [
-    {
-        "name": "Bufo-ally Stronger Clicks", 
-        "cost": 100, 
-        "effect": "click_power", 
-        "value": 2, 
-        "purchased": False, 
-        "description": "Doubles click power. Bufo-ally worth it!"
-    },
-    {
-        "name": "Hoppin' Mad Tadpoles", 
-        "cost": 500, 
-        "effect": "building_multi", 
-        "building": 0, 
-        "value": 2, 
-        "purchased": False, 
-        "description": "Doubles Tadpole production. They're not mad, just disappointed."
-    },
-    {
-        "name": "Frog-et About It", 
-        "cost": 1000, 
-        "effect": "building_multi", 
-        "building": 1, 
-        "value": 2, 
-        "purchased": False, 
-        "description": "Doubles Froglet production. No, seriously, frog-et about it!"
-    },
-    {
-        "name": "Bufo-al Recall", 
-        "cost": 5000, 
-        "effect": "building_multi", 
-        "building": 2, 
-        "value": 2, 
-        "purchased": False, 
-        "description": "Doubles Bufo production. They never forget a fly."
-    },
-    {
-        "name": "Bufonomics 101", 
-        "cost": 20000, 
-        "effect": "building_multi", 
-        "building": 3, 
-        "value": 2, 
-        "purchased": False, 
-        "description": "Doubles Bufo Magnus production. It's the bufo economy, silly!"
-    },
-    {
-        "name": "Bufo Rage", 
-        "cost": 10000, 
-        "effect": "click_power", 
-        "value": 10, 
-        "purchased": False, 
-        "description": "10x click power. They're hopping mad now!"
-    },
-    {
-        "name": "The Midas Bufo", 
-        "cost": 50000, 
-        "effect": "global_multi", 
-        "value": 2, 
-        "purchased": False, 
-        "description": "Doubles all production. Everything they touch turns to gold."
-    },
-    {
-        "name": "Amphibillioniare", 
-        "cost": 1000000, 
-        "effect": "global_multi", 
-        "value": 3, 
-        "purchased": False, 
-        "description": "Triples all production. Ribbit for your pleasure!"
-    }
-]
\ No newline at end of file
@@ -1,49 +1,127 @@
+import bisect
 import math
-import random
-import pygame
+
+from src.bignum import BigNum
+
+# Each building costs this much more than the previous one
+COST_GROWTH = 1.15
+LOG_COST_GROWTH = math.log10(COST_GROWTH)
+
+# Below this many units COST_GROWTH ** n is computed directly as a float (1.15 ** 4000 ~ 1e242)
+FLOAT_SAFE_UNITS = 4000
+
+# Unit prices are floored to whole bufos; from here on a float price is a whole number already
+FLOOR_PRICE_LIMIT = 2 ** 53
+
+# Prefix sums of floored unit prices by base cost (see floored_price_sums)
+_price_sums = {}
+
+# Suffixes for each group of three digits, after which numbers switch to scientific notation
+NUMBER_SUFFIXES = ["", "K", "M", "B", "T", "Qa", "Qi", "Sx", "Sp", "Oc", "No", "Dc"]
 
 def format_number(num):
-    """Format a number with K, M, B suffixes for readability"""
-    if num >= 1_000_000_000:
-        return f"{num / 1_000_000_000:.2f}B"
-    elif num >= 1_000_000:
-        return f"{num / 1_000_000:.2f}M"
-    elif num >= 1_000:
-        return f"{num / 1_000:.2f}K"
-    else:
-        return f"{num:.1f}"
-
-def calculate_building_cost(building):
-    """Calculate the cost of a building based on how many are owned"""
-    return math.floor(building["base_cost"] * (1.15 ** building["owned"]))
-
-class FloatingTextManager:
-    """Manages floating text effects in the game"""
-    
-    def __init__(self):
-        self.floating_texts = []
-    
-    def add_floating_text(self, text, position, color=(255, 255, 255), size=24, lifetime=1.0, speed=1.0):
-        """Add a new floating text effect"""
-        self.floating_texts.append({
-            "text": text,
-            "position": list(position),
-            "color": color,
-            "size": size,
-            "lifetime": lifetime,
-            "speed": speed,
-            "creation_time": pygame.time.get_ticks()
-        })
-    
-    def update(self):
-        """Update all floating texts"""
-        current_time = pygame.time.get_ticks()
-        for i in range(len(self.floating_texts) - 1, -1, -1):
-            text = self.floating_texts[i]
-            elapsed = (current_time - text["creation_time"]) / 1000.0
-            
-            if elapsed > text["lifetime"]:
-                self.floating_texts.pop(i)
-            else:
-                # Move text upward
-                text["position"][1] -= text["speed"]
\ No newline at end of file
+    """Format a number with K, M, B... suffixes, or scientific notation past the last suffix"""
+    num = BigNum(num)
+    if num < 1000:
+        if round(float(num), 1) < 1000:
+            return f"{float(num):.1f}"
+        # 999.95 and up round to 1000.0, which is 1.00K
+        num = BigNum(1000)
+    
+    # Round first so 999,999 is shown as 1.00M rather than 1000.00K
+    group = num.exponent // 3
+    value = round(num.mantissa * 10 ** (num.exponent % 3), 2)
+    if value >= 1000:
+        value, group = value / 1000, group + 1
+    if group < len(NUMBER_SUFFIXES):
+        return f"{value:.2f}{NUMBER_SUFFIXES[group]}"
+    
+    # Round first so 9.999e99 is shown as 1.00e100 rather than 10.00e99
+    mantissa, exponent = round(num.mantissa, 2), num.exponent
+    if mantissa >= 10:
+        mantissa, exponent = mantissa / 10, exponent + 1
+    return f"{mantissa:.2f}e{exponent}"
+
+def growth_power(units):
+    """COST_GROWTH ** units as a BigNum, without overflowing for huge unit counts"""
+    if units < FLOAT_SAFE_UNITS:
+        return BigNum(COST_GROWTH ** units)
+    return BigNum.from_log10(units * LOG_COST_GROWTH)
+
+def floored_price_sums(base_cost):
+    """
+    Running totals of the floored unit prices below FLOOR_PRICE_LIMIT.
+    
+    prefix[n] is what the first n units of a building with this base cost
+    cost together. The table (a few hundred entries) is built once per base
+    cost and shared by every building that has it.
+    """
+    prefix = _price_sums.get(base_cost)
+    if prefix is None:
+        prefix = [0]
+        units = 0
+        while units < FLOAT_SAFE_UNITS and base_cost * COST_GROWTH ** units < FLOOR_PRICE_LIMIT:
+            prefix.append(prefix[-1] + math.floor(base_cost * COST_GROWTH ** units))
+            units += 1
+        _price_sums[base_cost] = prefix
+    return prefix
+
+def series_cost(base_cost, first_unit, count):
+    """Cost of count units from first_unit on as a geometric series: first * (growth^count - 1) / (growth - 1)"""
+    first_cost = BigNum(base_cost) * growth_power(first_unit)
+    return (first_cost * (growth_power(count) - 1) / (COST_GROWTH - 1)).floor()
+
+def calculate_building_cost(building, count=1):
+    """
+    Calculate the cost of buying count buildings based on how many are owned.
+    
+    Every unit costs floor(base * growth^n) for the n-th building, so buying
+    in bulk costs exactly as much as buying one at a time. Units priced
+    below FLOOR_PRICE_LIMIT come from the prefix sums of floored_price_sums;
+    beyond them prices are whole numbers anyway and the rest is a geometric
+    series. Either way the cost takes constant time, however many units
+    are bought.
+    """
+    base_cost = building["base_cost"]
+    owned = building["owned"]
+    prefix = floored_price_sums(base_cost)
+    table_units = len(prefix) - 1
+    
+    end = owned + count
+    if end <= table_units:
+        return BigNum(prefix[end] - prefix[owned])
+    
+    start = max(owned, table_units)
+    return series_cost(base_cost, start, end - start) + (prefix[table_units] - prefix[min(owned, table_units)])
+
+def calculate_max_affordable(building, bufos):
+    """Calculate how many buildings can be bought with the given bufos in constant time"""
+    base_cost = building["base_cost"]
+    owned = building["owned"]
+    prefix = floored_price_sums(base_cost)
+    table_units = len(prefix) - 1
+    bufos = BigNum(bufos)
+    
+    # Units priced from the table: a binary search over the prefix sums
+    count = 0
+    if owned < table_units:
+        table_cost = prefix[table_units] - prefix[owned]
+        if bufos < table_cost:
+            return bisect.bisect_right(prefix, prefix[owned] + math.floor(float(bufos))) - 1 - owned
+        bufos = bufos - table_cost
+        count = table_units - owned
+        owned = table_units
+    
+    first_cost = BigNum(base_cost) * growth_power(owned)
+    if bufos < first_cost.floor():
+        return count
+    
+    # Invert the geometric series sum with a logarithm
+    units = int((bufos * (COST_GROWTH - 1) / first_cost + 1).log10() / LOG_COST_GROWTH)
+    
+    # Correct for floating point rounding (and the floor in the cost) at the boundary
+    while units > 0 and series_cost(base_cost, owned, units) > bufos:
+        units -= 1
+    while series_cost(base_cost, owned, units + 1) <= bufos:
+        units += 1
+    return count + units